@@ -4,7 +4,9 @@
 
 # ── IMPORTS & CONFIGURATION ──
 import asyncio
+import atexit
 import datetime
+import functools
 import json
 import logging
 import math
@@ -19,8 +21,12 @@ import sys
 import threading
 import time
 import traceback
-from concurrent.futures import ProcessPoolExecutor
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from contextlib import contextmanager
+from itertools import islice
+from logging.handlers import QueueHandler, QueueListener
+from queue import SimpleQueue
 from typing import Optional, List
 from urllib.parse import urlparse, parse_qs
 from melodify_profile import setup_profile, track_play, build_and_send_profile
@@ -31,6 +37,7 @@ import lyricsgenius
 import psutil
 import syncedlyrics
 import yt_dlp
+from aiolimiter import AsyncLimiter
 from cachetools import TTLCache
 from discord import Embed, ButtonStyle, app_commands
 from discord.ext import commands
@@ -45,9 +52,13 @@ load_dotenv()
 
 # ── REGEX PATTERNS ──
 SPOTIFY_REGEX = re.compile(r"^(https?://)?(open\.spotify\.com)/.+$")
+SPOTIFY_ID_REGEX = re.compile(
+    r"open\.spotify\.com/(?:intl-[\w-]+/)?(track|album|playlist)/([A-Za-z0-9]{22})"
+)
 DEEZER_REGEX = re.compile(
     r"^(https?://)?((www\.)?deezer\.com/(?:[a-z]{2}/)?(track|playlist|album|artist)/.+|(link\.deezer\.com)/s/.+)$"
 )
+DEEZER_SHARE_REGEX = re.compile(r"^(https?://)?(link\.deezer\.com)/s/.+$")
 APPLE_MUSIC_REGEX = re.compile(r"^(https?://)?(music\.apple\.com)/.+$")
 TIDAL_REGEX = re.compile(r"^(https?://)?(www\.)?tidal\.com/.+$")
 AMAZON_MUSIC_REGEX = re.compile(
@@ -61,11 +72,23 @@ DIRECT_LINK_REGEX = re.compile(
     r"^(https?://).+\.(mp3|wav|ogg|m4a|mp4|webm|flac)(\?.+)?$", re.IGNORECASE
 )
 TIME_TAG_RE = re.compile(r"\[(\d{2}):(\d{2})\.(\d{2,3})\](.*)")
+URL_SCHEME_REGEX = re.compile(r"https?://")
+SEARCH_PREFIX_REGEX = re.compile(r"(?:yt|sc)search\d*:")
+CONTROL_CHAR_REGEX = re.compile(r"[\x00-\x1F\x7F]")
+CJK_BRACKET_REGEX = re.compile(r"[（）《》【】「」『』〔〕〈〉\[\]]")
+ATEMPO_REGEX = re.compile(r"atempo=([\d.]+)")
+ASETRATE_REGEX = re.compile(r"asetrate=[\d.]+\*([\d.]+)")
 
 # ── CONSTANTS ──
 SILENT_MESSAGES = True
 IS_PUBLIC_VERSION = False
 AVAILABLE_COOKIES = [f"cookies_{i}.txt" for i in range(1, 6)]
+AUTOPLAY_SEED_DOMAINS = ("youtube.com", "youtu.be", "soundcloud.com")
+AUTOPLAY_HISTORY_MAX = 20
+HISTORY_MAX = 50  # /previous + autoplay seed fallback + persisted state
+IDLE_DISCONNECT_DELAY = 60  # seconds alone + idle before leaving
+AUTOPLAY_MIN_DURATION = 30  # seconds
+AUTOPLAY_MAX_DURATION = 600
 
 AUDIO_FILTERS = {
     "slowed": "asetrate=44100*0.8",
@@ -90,8 +113,21 @@ AUDIO_FILTERS = {
 }
 
 # ── LOGGING ──
+# Emitters (event loop, audio thread, executors) only enqueue records; the
+# listener thread does the actual stream/file I/O.
+_log_queue = SimpleQueue()
+_log_handlers = [logging.StreamHandler(sys.stdout)]
+if LOG_FILE := os.getenv("LOG_FILE"):
+    _log_handlers.append(logging.FileHandler(LOG_FILE, encoding="utf-8"))
+for _h in _log_handlers:
+    _h.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(message)s"))
+_log_listener = QueueListener(_log_queue, *_log_handlers, respect_handler_level=True)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
 logging.basicConfig(
-    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    level=getattr(logging, os.getenv("LOG_LEVEL", "INFO").upper(), logging.INFO),
+    handlers=[QueueHandler(_log_queue)],
 )
 logger = logging.getLogger(__name__)
 
@@ -120,6 +156,12 @@ if _IS_MAIN_PROCESS:
 # ── CACHES & TRANSLATOR ──
 url_cache = TTLCache(maxsize=75_000, ttl=7_200)  # metadata cache
 stream_url_cache = TTLCache(maxsize=5_000, ttl=300)  # stream URLs (5 min)
+# Raw extract_info results. Flat listings are stable for a while; full
+# extractions carry short-lived CDN stream URLs so they expire sooner.
+ytdl_flat_cache = TTLCache(maxsize=512, ttl=600)
+ytdl_full_cache = TTLCache(maxsize=512, ttl=300)
+# Single-flight map: identical concurrent lookups await one extraction
+_ytdl_inflight: dict = {}
 
 I18N_DIR = os.path.join(os.path.dirname(__file__), "i18n")
 translator = I18nTranslator(default_locale=Locale.EN_US, translations_dir=I18N_DIR)
@@ -130,6 +172,13 @@ try:
 except NotImplementedError:
     process_pool = ProcessPoolExecutor(max_workers=os.cpu_count())
 
+# ── THREAD POOLS ── (keep blocking I/O off the shared default executor)
+_YTDL_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="ytdl")
+_SPOTIFY_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="spotify")
+_LYRICS_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="lyrics")
+for _pool in (_YTDL_POOL, _SPOTIFY_POOL, _LYRICS_POOL):
+    atexit.register(_pool.shutdown, wait=False)
+
 # ════════════════════════════════════════════════════════════════════════════
 # ▌ DATABASE - WAL Mode + Context Manager
 # ════════════════════════════════════════════════════════════════════════════
@@ -197,6 +246,7 @@ class MusicPlayer:
         "current_task",
         "queue",
         "history",
+        "autoplay_history",
         "radio_playlist",
         "current_url",
         "current_info",
@@ -217,6 +267,7 @@ class MusicPlayer:
         "is_current_live",
         "hydration_task",
         "hydration_lock",
+        "prefetch_task",
         "suppress_next_now_playing",
         "is_auto_promoting",
         "is_cleaning",
@@ -232,6 +283,11 @@ class MusicPlayer:
         "silence_management_lock",
         "is_paused_by_leave",
         "manual_stop",
+        "idle_since",
+        "playback_event",
+        "human_count",
+        "human_count_channel_id",
+        "pending_disconnect_task",
     )
 
     def __init__(self):
@@ -239,6 +295,7 @@ class MusicPlayer:
         self.current_task = None
         self.queue = asyncio.Queue(maxsize=5000)  # ← Prevent unbounded growth
         self.history = []
+        self.autoplay_history = OrderedDict()  # norm title -> track key, LRU
         self.radio_playlist = []
         self.current_url = None
         self.current_info = None
@@ -247,7 +304,7 @@ class MusicPlayer:
         self.autoplay_enabled = False
         self.last_was_single = False
         self.start_time = 0
-        self.playback_started_at = None
+        self.playback_started_at = None  # time.monotonic() at stream start
         self.active_filter = None
         self.seek_info = None
         self.lyrics_task = None
@@ -259,6 +316,7 @@ class MusicPlayer:
         self.is_current_live = False
         self.hydration_task = None
         self.hydration_lock = asyncio.Lock()
+        self.prefetch_task = None
         self.suppress_next_now_playing = False
         self.is_auto_promoting = False
         self.is_cleaning = False
@@ -275,6 +333,26 @@ class MusicPlayer:
         self.silence_management_lock = asyncio.Lock()
         self.is_paused_by_leave = False
         self.manual_stop = False
+        self.idle_since = None  # loop.time() when the queue ran dry
+        self.playback_event = asyncio.Event()  # set whenever a stream starts
+        self.human_count = 0  # non-bot members in the bot's voice channel
+        self.human_count_channel_id = None  # channel human_count belongs to
+        self.pending_disconnect_task = None  # single leave-if-alone timer
+
+
+def count_humans(mp: MusicPlayer, channel) -> int:
+    """Human listeners in `channel`; rescans only when the channel changed."""
+    if mp.human_count_channel_id != channel.id:
+        mp.human_count = sum(1 for m in channel.members if not m.bot)
+        mp.human_count_channel_id = channel.id
+    return mp.human_count
+
+
+def push_history(mp: MusicPlayer, *items):
+    """Append to history, keeping only the last HISTORY_MAX entries."""
+    mp.history.extend(items)
+    if len(mp.history) > HISTORY_MAX:
+        del mp.history[:-HISTORY_MAX]
 
 
 class GuildModel:
@@ -290,6 +368,7 @@ class GuildModel:
         "controller_message_id",
         "_controller_update_task",  # NEW: per-guild debounce task
         "_status_update_task",  # NEW: per-guild VC-status debounce
+        "_voice_connect_lock",
     )
 
     def __init__(self, guild_id: int):
@@ -304,6 +383,7 @@ class GuildModel:
         self.controller_message_id = None
         self._controller_update_task = None
         self._status_update_task = None
+        self._voice_connect_lock = asyncio.Lock()
 
 
 # ── GUILD STATE REGISTRY ──
@@ -313,6 +393,10 @@ _guild_states_lock = threading.Lock()
 
 def get_guild_state(guild_id: int) -> GuildModel:
     """Thread-safe retrieval or creation of guild state."""
+    # Lock-free fast path: dict.get is atomic and the entry almost always exists
+    state = guild_states.get(guild_id)
+    if state is not None:
+        return state
     with _guild_states_lock:
         if guild_id not in guild_states:
             guild_states[guild_id] = GuildModel(guild_id)
@@ -337,7 +421,11 @@ async def save_all_states():
     logger.info("Saving all guild states...")
     rows_settings, rows_allowlist, rows_playback = [], [], []
 
-    for guild_id, state in guild_states.items():
+    # Snapshot: get_guild_state() may insert from other threads mid-iteration
+    with _guild_states_lock:
+        snapshot = tuple(guild_states.items())
+
+    for guild_id, state in snapshot:
         player = state.music_player
         rows_settings.append(
             (
@@ -361,7 +449,8 @@ async def save_all_states():
         if player.playback_started_at:
             ts = (
                 player.start_time
-                + (time.time() - player.playback_started_at) * player.playback_speed
+                + (time.monotonic() - player.playback_started_at)
+                * player.playback_speed
             )
         elif player.start_time:
             ts = player.start_time
@@ -478,6 +567,7 @@ async def load_states_on_startup():
                 else None
             )
             mp.history = json.loads(row["history_json"]) if row["history_json"] else []
+            del mp.history[:-HISTORY_MAX]
             mp.radio_playlist = (
                 json.loads(row["radio_playlist_json"])
                 if row["radio_playlist_json"]
@@ -493,7 +583,7 @@ async def load_states_on_startup():
                 if ch and isinstance(ch, discord.VoiceChannel):
                     mp.voice_client = await ch.connect()
                     mp.text_channel = bot.get_channel(state.controller_channel_id or 0)
-                    bot.loop.create_task(
+                    spawn(
                         play_audio(
                             gid, seek_time=row["playback_timestamp"], is_a_loop=True
                         )
@@ -509,6 +599,12 @@ async def load_states_on_startup():
 # ════════════════════════════════════════════════════════════════════════════
 
 
+YTDL_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".ytdl-cache")
+
+# Per-worker-process YoutubeDL instances, keyed by their options
+_ydl_instances: dict = {}
+
+
 def ydl_worker(ydl_opts: dict, query: str, cookies_file: Optional[str] = None) -> dict:
     """Runs in subprocess — low priority, returns serialisable dict."""
     p = psutil.Process()
@@ -517,15 +613,24 @@ def ydl_worker(ydl_opts: dict, query: str, cookies_file: Optional[str] = None) -
             p.nice(psutil.IDLE_PRIORITY_CLASS)
         else:
             p.nice(19)
-    except Exception:
+    except (psutil.Error, OSError):
         pass
 
-    if cookies_file and os.path.exists(cookies_file):
-        ydl_opts["cookiefile"] = cookies_file
+    # Persist player/signature caches across runs and worker restarts
+    ydl_opts.setdefault("cachedir", YTDL_CACHE_DIR)
 
     try:
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            return {"status": "ok", "data": ydl.extract_info(query, download=False)}
+        if cookies_file and os.path.exists(cookies_file):
+            # Cookie runs stay one-shot so the jar is saved on close
+            with yt_dlp.YoutubeDL({**ydl_opts, "cookiefile": cookies_file}) as ydl:
+                data = ydl.extract_info(query, download=False)
+        else:
+            key = json.dumps(ydl_opts, sort_keys=True, default=str)
+            ydl = _ydl_instances.get(key)
+            if ydl is None:
+                ydl = _ydl_instances[key] = yt_dlp.YoutubeDL(ydl_opts)
+            data = ydl.extract_info(query, download=False)
+        return {"status": "ok", "data": data}
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
@@ -555,8 +660,48 @@ async def run_ydl_with_low_priority(
     return result["data"]
 
 
+def _copy_info(info: dict) -> dict:
+    """Copy a cached info dict deep enough that callers can annotate it."""
+    out = dict(info)
+    if isinstance(out.get("entries"), list):
+        out["entries"] = [dict(e) if isinstance(e, dict) else e for e in out["entries"]]
+    return out
+
+
 async def fetch_video_info_with_retry(
     query: str, ydl_opts_override: Optional[dict] = None
+) -> dict:
+    """Cached front-end for _fetch_video_info; concurrent callers share a fetch."""
+    override = ydl_opts_override or {}
+    # Search text is case-insensitive upstream; "Foo  Bar" and "foo bar" share
+    # one cache entry and one in-flight extraction.
+    cache_query = query
+    if SEARCH_PREFIX_REGEX.match(query):
+        cache_query = WHITESPACE_REGEX.sub(" ", query).strip().casefold()
+    key = (cache_query, tuple(sorted(override.items())))
+    cache = ytdl_flat_cache if override.get("extract_flat") else ytdl_full_cache
+
+    info = cache.get(key)
+    if info is not None:
+        return _copy_info(info)
+
+    task = _ytdl_inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_fetch_video_info(query, override))
+        _ytdl_inflight[key] = task
+
+        def _done(t: asyncio.Task):
+            _ytdl_inflight.pop(key, None)
+            if not t.cancelled() and t.exception() is None:
+                cache[key] = t.result()
+
+        task.add_done_callback(_done)
+    # Shield: one caller timing out must not abort the shared extraction
+    return _copy_info(await asyncio.shield(task))
+
+
+async def _fetch_video_info(
+    query: str, ydl_opts_override: Optional[dict] = None
 ) -> dict:
     """Fetch info; retry with cookie rotation on bot detection or age-restriction."""
     base_opts = {
@@ -628,12 +773,38 @@ async def fetch_meta(url: str, _) -> Optional[dict]:
 # ════════════════════════════════════════════════════════════════════════════
 
 
+# The event loop only keeps weak references to tasks; hold fire-and-forget
+# tasks here until they finish so they can't be collected mid-flight.
+_background_tasks: set[asyncio.Task] = set()
+
+
+def spawn(coro) -> asyncio.Task:
+    task = asyncio.get_running_loop().create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
+
+
 def get_messages(key: str, guild_id: int, **kwargs) -> str:
     """Get localized message for guild with parameters."""
     state = get_guild_state(guild_id)
     return translator.t(key, locale=state.locale.value, **kwargs)
 
 
+@functools.lru_cache(maxsize=None)
+def _error_embed_dict(key: str, locale: Locale) -> dict:
+    color = 0xFF9AA2 if locale == Locale.EN_X_KAWAII else discord.Color.red()
+    return Embed(
+        description=translator.t(key, locale=locale.value), color=color
+    ).to_dict()
+
+
+def error_embed(key: str, guild_id: int) -> Embed:
+    """Stock red error embed for a message key, built once per locale."""
+    locale = get_guild_state(guild_id).locale
+    return Embed.from_dict(_error_embed_dict(key, locale))
+
+
 def format_duration(seconds: Optional[float]) -> str:
     """Format seconds to HH:MM:SS or MM:SS format."""
     if seconds is None or seconds < 0:
@@ -674,8 +845,22 @@ def parse_time(time_str: str) -> Optional[int]:
 
 def sanitize_query(query: str) -> str:
     """Remove control characters and normalize whitespace in search query."""
-    query = re.sub(r"[\x00-\x1F\x7F]", "", query)
-    return re.sub(r"\s+", " ", query).strip()
+    query = CONTROL_CHAR_REGEX.sub("", query)
+    return WHITESPACE_REGEX.sub(" ", query).strip()
+
+
+def is_autoplay_seed(url: str) -> bool:
+    for domain in AUTOPLAY_SEED_DOMAINS:
+        if domain in url:
+            return True
+    return False
+
+
+@functools.lru_cache(maxsize=1024)
+def parse_spotify_url(url: str) -> Optional[tuple[str, str]]:
+    """Return (kind, id) for a Spotify track/album/playlist URL."""
+    m = SPOTIFY_ID_REGEX.search(url)
+    return (m.group(1), m.group(2)) if m else None
 
 
 def get_video_id(url: str) -> Optional[str]:
@@ -697,9 +882,9 @@ def get_speed_multiplier_from_filters(active_filters: set) -> float:
     pitch = tempo = 1.0
     for f in active_filters:
         fv = AUDIO_FILTERS.get(f, "")
-        if m := re.search(r"atempo=([\d.]+)", fv):
+        if m := ATEMPO_REGEX.search(fv):
             tempo *= float(m.group(1))
-        if m := re.search(r"asetrate=[\d.]+\*([\d.]+)", fv):
+        if m := ASETRATE_REGEX.search(fv):
             pitch *= float(m.group(1))
     return pitch * tempo
 
@@ -722,7 +907,7 @@ def get_file_duration(file_path: str) -> float:
             text=True,
         )
         return float(r.stdout.strip()) if r.returncode == 0 else 0.0
-    except Exception:
+    except (OSError, ValueError):
         return 0.0
 
 
@@ -745,6 +930,35 @@ TITLE_CLEAN_PATTERNS = [
     re.compile(r"^\s*-"),
 ]
 WHITESPACE_REGEX = re.compile(r"\s+")
+BRACKETS_REGEX = re.compile(r"\[.*?\]|\(.*?\)")
+ARTIST_NOISE_PATTERNS = [
+    re.compile(re.escape(n), re.IGNORECASE)
+    for n in (
+        "xoxo",
+        "official",
+        "beats",
+        "prod",
+        "music",
+        "records",
+        "tv",
+        "lyrics",
+        "archive",
+        "- Topic",
+    )
+]
+SONG_TITLE_PATTERNS = [
+    re.compile(r"\[.*?\]"),
+    re.compile(r"\(.*?\)"),
+    re.compile(r"\s*feat\..*"),
+    re.compile(r"\s*ft\..*"),
+    re.compile(r"\s*w/.*"),
+    re.compile(r"(?i)official video"),
+    re.compile(r"(?i)lyric video"),
+    re.compile(r"(?i)audio"),
+    re.compile(r"(?i)hd"),
+    re.compile(r"4K"),
+    re.compile(r"\+"),
+]
 
 
 def clean_display_title(title: str) -> str:
@@ -763,41 +977,16 @@ def clean_display_title(title: str) -> str:
 def get_cleaned_song_info(info: dict, guild_id: int) -> tuple[str, str]:
     title = info.get("title", get_messages("player.unknown_title", guild_id))
     artist = info.get("uploader", get_messages("player.unknown_artist", guild_id))
-    _NOISE = [
-        "xoxo",
-        "official",
-        "beats",
-        "prod",
-        "music",
-        "records",
-        "tv",
-        "lyrics",
-        "archive",
-        "- Topic",
-    ]
     clean_artist = artist
-    for n in _NOISE:
-        clean_artist = re.sub(r"(?i)" + re.escape(n), "", clean_artist).strip()
-
-    _PAT = [
-        r"\[.*?\]",
-        r"\(.*?\)",
-        r"\s*feat\..*",
-        r"\s*ft\..*",
-        r"\s*w/.*",
-        r"(?i)official video",
-        r"(?i)lyric video",
-        r"(?i)audio",
-        r"(?i)hd",
-        r"4K",
-        r"\+",
-    ]
+    for pattern in ARTIST_NOISE_PATTERNS:
+        clean_artist = pattern.sub("", clean_artist).strip()
+
     clean_title = title
-    for p in _PAT:
-        clean_title = re.sub(p, "", clean_title)
+    for pattern in SONG_TITLE_PATTERNS:
+        clean_title = pattern.sub("", clean_title)
     clean_title = clean_title.replace(clean_artist, "").replace(artist, "").strip(" -")
     if not clean_title:
-        clean_title = re.sub(r"\[.*?\]|\(.*?\)", "", title).strip()
+        clean_title = BRACKETS_REGEX.sub("", title).strip()
     return clean_title, clean_artist
 
 
@@ -914,6 +1103,23 @@ def clear_audio_cache(guild_id: int):
 # ════════════════════════════════════════════════════════════════════════════
 
 
+_OPUS_LIBS = ("libopus.so.0", "libopus.so", "libopus.0.dylib", "opus", "libopus")
+
+
+def load_opus() -> None:
+    """Load libopus once up front instead of on the first voice connect."""
+    if discord.opus.is_loaded():
+        return
+    for name in _OPUS_LIBS:
+        try:
+            discord.opus.load_opus(name)
+        except OSError:
+            continue
+        logger.info(f"Loaded opus library: {name}")
+        return
+    logger.warning("No opus library found; relying on discord.py's default lookup.")
+
+
 async def safe_stop(vc: discord.VoiceClient) -> None:
     """Kill FFmpeg process + call discord.py stop() cleanly."""
     if not vc or not (vc.is_playing() or vc.is_paused()):
@@ -922,18 +1128,38 @@ async def safe_stop(vc: discord.VoiceClient) -> None:
     if isinstance(src, discord.PCMVolumeTransformer):
         src = src.original
     if (
-        isinstance(src, discord.FFmpegPCMAudio)
+        isinstance(src, discord.FFmpegAudio)
         and hasattr(src, "_process")
         and src._process
     ):
         try:
             src._process.kill()
-        except Exception:
+        except OSError:
             pass
     vc.stop()
     await asyncio.sleep(0.05)
 
 
+async def apply_volume(mp: MusicPlayer) -> None:
+    """Apply mp.volume to the live source; untransformed streams are restarted."""
+    vc = mp.voice_client
+    if not vc or not (vc.is_playing() or vc.is_paused()):
+        return
+    if isinstance(vc.source, discord.PCMVolumeTransformer):
+        vc.source.volume = mp.volume
+        return
+    if mp.volume == 1.0:
+        return
+    if vc.is_paused():
+        # A restart would resume playback; resume paths call us again
+        return
+    elapsed = mp.start_time
+    if mp.playback_started_at:
+        elapsed += (time.monotonic() - mp.playback_started_at) * mp.playback_speed
+    mp.is_seeking, mp.seek_info = True, elapsed
+    await safe_stop(vc)
+
+
 _vc_status_pending: dict[int, str] = {}
 
 
@@ -984,73 +1210,81 @@ async def ensure_voice_connection(
         await _send(embed=embed, ephemeral=True, silent=SILENT_MESSAGES)
         return None
 
-    vc = interaction.guild.voice_client
-
-    # Stale client → reset
-    if vc and not vc.is_connected():
-        mp.voice_client = None
-        vc = None
+    # One connect at a time per guild, so racing /play calls share a client
+    async with state._voice_connect_lock:
+        vc = interaction.guild.voice_client
 
-    # Sync internal state
-    if vc and mp.voice_client != vc:
-        mp.voice_client = vc
+        # Stale client → reset
+        if vc and not vc.is_connected():
+            mp.voice_client = None
+            vc = None
 
-    if not vc:
-        try:
-            vc = await member.voice.channel.connect()
+        # Sync internal state
+        if vc and mp.voice_client != vc:
             mp.voice_client = vc
 
-            if mp.is_resuming_after_clean and mp.resume_info:
-                info_r, time_r = mp.resume_info["info"], mp.resume_info["time"]
-                mp.current_info, mp.current_url = info_r, info_r.get("url")
-                bot.loop.create_task(
-                    play_audio(guild_id, seek_time=time_r, is_a_loop=True)
+        if not vc:
+            try:
+                vc = await member.voice.channel.connect()
+                mp.voice_client = vc
+                mp.human_count_channel_id = None  # recount the new channel
+
+                if mp.is_resuming_after_clean and mp.resume_info:
+                    info_r, time_r = mp.resume_info["info"], mp.resume_info["time"]
+                    mp.current_info, mp.current_url = info_r, info_r.get("url")
+                    spawn(play_audio(guild_id, seek_time=time_r, is_a_loop=True))
+                    mp.is_resuming_after_clean = False
+                    mp.resume_info = None
+
+            except discord.ClientException as e:
+                if "Already connected" in str(e):
+                    # Zombie connection — force-heal with recovery
+                    if mp.voice_client and mp.current_info:
+                        elapsed = (
+                            (time.monotonic() - mp.playback_started_at)
+                            * mp.playback_speed
+                            if mp.playback_started_at
+                            else 0
+                        )
+                        mp.resume_info = {
+                            "info": mp.current_info.copy(),
+                            "time": mp.start_time + elapsed,
+                        }
+                        mp.is_resuming_after_clean = True
+                    try:
+                        mp.is_cleaning = True
+                        await mp.voice_client.disconnect(force=True)
+                        await asyncio.sleep(0.5)
+                    finally:
+                        mp.is_cleaning = False
+                    # Retry outside the lock; asyncio.Lock is not re-entrant
+                    vc = None
+                else:
+                    raise
+            except Exception as e:
+                embed = Embed(
+                    description=get_messages("connection_error", guild_id),
+                    color=0xFF9AA2 if is_kw else discord.Color.red(),
                 )
-                mp.is_resuming_after_clean = False
-                mp.resume_info = None
-
-        except discord.ClientException as e:
-            if "Already connected" in str(e):
-                # Zombie connection — force-heal with recovery
-                if mp.voice_client and mp.current_info:
-                    elapsed = (
-                        (time.time() - mp.playback_started_at) * mp.playback_speed
-                        if mp.playback_started_at
-                        else 0
-                    )
-                    mp.resume_info = {
-                        "info": mp.current_info.copy(),
-                        "time": mp.start_time + elapsed,
-                    }
-                    mp.is_resuming_after_clean = True
-                try:
-                    mp.is_cleaning = True
-                    await mp.voice_client.disconnect(force=True)
-                    await asyncio.sleep(0.5)
-                finally:
-                    mp.is_cleaning = False
-                return await ensure_voice_connection(interaction)
-            raise
-        except Exception as e:
-            embed = Embed(
-                description=get_messages("connection_error", guild_id),
-                color=0xFF9AA2 if is_kw else discord.Color.red(),
-            )
-            await interaction.followup.send(
-                embed=embed, ephemeral=True, silent=SILENT_MESSAGES
-            )
-            logger.error(f"Voice connection error: {e}", exc_info=True)
-            return None
+                await interaction.followup.send(
+                    embed=embed, ephemeral=True, silent=SILENT_MESSAGES
+                )
+                logger.error(f"Voice connection error: {e}", exc_info=True)
+                return None
+
+        elif vc.channel != member.voice.channel:
+            await vc.move_to(member.voice.channel)
+            mp.human_count_channel_id = None
+            await asyncio.sleep(0.3)
 
-    elif vc.channel != member.voice.channel:
-        await vc.move_to(member.voice.channel)
-        await asyncio.sleep(0.3)
+    if vc is None:
+        return await ensure_voice_connection(interaction)
 
     if isinstance(vc.channel, discord.StageChannel):
         if interaction.guild.me.voice and interaction.guild.me.voice.suppress:
             try:
                 await interaction.guild.me.edit(suppress=False)
-            except Exception:
+            except discord.HTTPException:
                 pass
 
     if not state.controller_channel_id:
@@ -1091,7 +1325,7 @@ async def play_silence_loop(guild_id: int) -> None:
         logger.error(f"[{guild_id}] Silence loop error: {e}")
     finally:
         if vc.is_connected() and mp.is_playing_silence:
-            bot.loop.create_task(safe_stop(vc))
+            spawn(safe_stop(vc))
         mp.is_playing_silence = False
 
 
@@ -1137,23 +1371,25 @@ async def _do_update_controller(
         view = MusicControllerView(bot_ref, guild_id)
 
         if interaction:
-            await interaction.edit_original_response(
+            # edit_original_response already returns the message
+            msg = await interaction.edit_original_response(
                 content=None, embed=embed, view=view
             )
-            msg = await interaction.original_response()
             old_id = state.controller_message_id
             if old_id and old_id != msg.id:
                 try:
-                    await (await channel.fetch_message(old_id)).delete()
-                except Exception:
+                    await channel.get_partial_message(old_id).delete()
+                except discord.HTTPException:
                     pass
             state.controller_message_id = msg.id
         else:
             msg_id = state.controller_message_id
             if msg_id:
                 try:
-                    msg = await channel.fetch_message(msg_id)
-                    await msg.edit(embed=embed, view=view)
+                    # Partial message: one PATCH instead of GET + PATCH
+                    await channel.get_partial_message(msg_id).edit(
+                        embed=embed, view=view
+                    )
                 except (discord.NotFound, discord.Forbidden, discord.HTTPException):
                     new_msg = await channel.send(embed=embed, view=view, silent=True)
                     state.controller_message_id = new_msg.id
@@ -1222,11 +1458,12 @@ async def create_controller_embed(bot_ref, guild_id: int) -> Embed:
             ci = [t.get("url") for t in mp.radio_playlist].index(cur_url)
             queue_snap = mp.radio_playlist[ci + 1 :] + mp.radio_playlist[:ci]
         except (ValueError, IndexError):
-            queue_snap = list(mp.queue._queue)
+            queue_snap = mp.queue._queue
     else:
-        queue_snap = list(mp.queue._queue)
+        queue_snap = mp.queue._queue
 
-    display_tracks = queue_snap[:5]
+    # Only the first five rows are shown; don't copy a deep queue to get them
+    display_tracks = list(islice(queue_snap, 5))
 
     # --- Selective hydration: only items missing duration/title ---
     lazy_to_resolve = [
@@ -1425,6 +1662,8 @@ intents.voice_states = True
 class PlayifyBot(commands.Bot):
     async def close(self):
         await save_all_states()
+        if _http_session and not _http_session.closed:
+            await _http_session.close()
         await super().close()
 
 
@@ -1435,6 +1674,17 @@ bot = PlayifyBot(command_prefix="!", intents=intents)
 # ════════════════════════════════════════════════════════════════════════════
 
 
+# Caps concurrent flat YouTube searches across all guilds
+_YT_SEARCH_SEM = asyncio.Semaphore(4)
+
+
+async def _yt_flat_search(query: str) -> dict:
+    async with _YT_SEARCH_SEM:
+        return await fetch_video_info_with_retry(
+            query, {"noplaylist": True, "extract_flat": True}
+        )
+
+
 class LazySearchItem:
     __slots__ = (
         "query_dict",
@@ -1474,8 +1724,8 @@ class LazySearchItem:
 
             # Strip CJK brackets & special chars yang merusak YouTube search
             def _clean(s: str) -> str:
-                s = re.sub(r"[（）《》【】「」『』〔〕〈〉\[\]]", " ", s)
-                return re.sub(r"\s+", " ", s).strip()
+                s = CJK_BRACKET_REGEX.sub(" ", s)
+                return WHITESPACE_REGEX.sub(" ", s).strip()
 
             clean_title = _clean(self.title)
             clean_artist = _clean(self.artist)
@@ -1486,33 +1736,42 @@ class LazySearchItem:
                 f"{clean_title}",
                 f"{self.title} {self.artist}",  # fallback: query asli tanpa "official"
             ]
-
+            # Fallbacks run only once the previous term fails: extractions are
+            # shielded and can't be cancelled, so firing them all up front
+            # would run every term to completion on every resolve.
             last_exc: Exception = ValueError("No results")
-            for term in search_terms:
+            for q in dict.fromkeys(sanitize_query(t) for t in search_terms):
                 try:
-                    info = await fetch_video_info_with_retry(
-                        f"ytsearch5:{sanitize_query(term)}",
-                        {"noplaylist": True, "extract_flat": True},
+                    entries = (await _yt_flat_search(f"ytsearch3:{q}")).get(
+                        "entries", []
                     )
-                    entries = info.get("entries", [])
-                    if not entries:
+                    best = next((e for e in entries if e), None)
+                    if not best:
                         continue
 
-                    best = entries[0]
                     url = best.get("webpage_url") or best.get("url", "")
-                    if not url:
-                        continue
                     if not url.startswith("http"):
-                        url = f"https://www.youtube.com/watch?v={url}"
-
-                    full = await asyncio.wait_for(
-                        fetch_video_info_with_retry(url, {"noplaylist": True}),
-                        timeout=20.0,
-                    )
-                    full["requester"] = self.requester
-                    full["original_platform"] = self.original_platform
-                    self.resolved_info = full
-                    return full
+                        vid = best.get("id") or url
+                        if not vid:
+                            continue
+                        url = f"https://www.youtube.com/watch?v={vid}"
+
+                    # The flat entry is enough to queue; play_audio fetches
+                    # the stream itself, so skip a second full extraction.
+                    self.resolved_info = {
+                        "url": url,
+                        "webpage_url": url,
+                        "title": best.get("title") or self.title,
+                        "uploader": best.get("uploader")
+                        or best.get("channel")
+                        or self.artist,
+                        "duration": best.get("duration") or 0,
+                        "thumbnail": best.get("thumbnail")
+                        or (best.get("thumbnails") or [{}])[-1].get("url"),
+                        "requester": self.requester,
+                        "original_platform": self.original_platform,
+                    }
+                    return self.resolved_info
                 except Exception as e:
                     last_exc = e
                     continue
@@ -1559,13 +1818,61 @@ async def handle_playback_error(guild_id: int, error: Exception):
 
     # Full reset
     mp.current_task = mp.current_info = mp.current_url = None
-    while not mp.queue.empty():
-        mp.queue.get_nowait()
+    release_player(mp)
     if mp.voice_client:
         await mp.voice_client.disconnect()
     get_guild_state(guild_id).music_player = MusicPlayer()
 
 
+def cancel_prefetch(mp: MusicPlayer):
+    if mp.prefetch_task and not mp.prefetch_task.done():
+        mp.prefetch_task.cancel()
+    mp.prefetch_task = None
+
+
+def release_player(mp: MusicPlayer) -> None:
+    """Detach a player that is being replaced so nothing keeps it alive.
+
+    Background tasks close over the player (and through it the old
+    VoiceClient), so a stray silence or lyrics loop would pin both.
+    """
+    cancel_prefetch(mp)
+    for task in (mp.lyrics_task, mp.silence_task):
+        if task and not task.done():
+            task.cancel()
+    while not mp.queue.empty():
+        mp.queue.get_nowait()
+    # Wake any idle-disconnect wait on this player; with idle_since cleared
+    # it returns without touching the voice client
+    mp.idle_since = None
+    mp.playback_event.set()
+
+
+async def _prefetch_next(guild_id: int, mp: MusicPlayer):
+    """Resolve the head of the queue while the current song plays."""
+    try:
+        nxt = mp.queue._queue[0]
+    except IndexError:
+        return
+    try:
+        if isinstance(nxt, LazySearchItem):
+            nxt = await nxt.resolve()
+            if not nxt or nxt.get("error"):
+                return
+        if nxt.get("source_type") == "file":
+            return
+        url = nxt.get("webpage_url") or nxt.get("url")
+        if not url or url in stream_url_cache:
+            return
+        # Only warm the extraction cache: play_audio's refresh then returns
+        # instantly and still merges the full info (thumbnail, uploader, ...)
+        await fetch_video_info_with_retry(url)
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        logger.debug(f"[{guild_id}] Prefetch failed: {e}")
+
+
 async def play_audio(
     guild_id: int,
     seek_time: float = 0,
@@ -1600,7 +1907,8 @@ async def play_audio(
                 if mp.playback_started_at:
                     retry_pos = (
                         mp.start_time
-                        + (time.time() - mp.playback_started_at) * mp.playback_speed
+                        + (time.monotonic() - mp.playback_started_at)
+                        * mp.playback_speed
                     )
                 # Nonaktifkan semua filter agar tidak loop crash terus
                 state.server_filters.clear()
@@ -1609,9 +1917,7 @@ async def play_audio(
                 logger.warning(
                     f"[{guild_id}] FFmpeg crash detected — clearing filters and replaying from {retry_pos:.1f}s"
                 )
-                bot.loop.create_task(
-                    play_audio(guild_id, seek_time=retry_pos, is_a_loop=True)
-                )
+                spawn(play_audio(guild_id, seek_time=retry_pos, is_a_loop=True))
                 return
 
         try:
@@ -1621,20 +1927,19 @@ async def play_audio(
             finished = mp.current_info
             if finished and mp.voice_client and mp.voice_client.channel:
                 played_ms = int(
-                    (time.time() - (mp.playback_started_at or time.time())) * 1000
+                    (time.monotonic() - (mp.playback_started_at or time.monotonic()))
+                    * 1000
                 )
                 vc_members = [
                     m.id for m in mp.voice_client.channel.members if not m.bot
                 ]
                 req = finished.get("requester")
                 req_id = req.id if hasattr(req, "id") else bot.user.id
-                bot.loop.create_task(
-                    track_play(guild_id, finished, req_id, played_ms, vc_members)
-                )
+                spawn(track_play(guild_id, finished, req_id, played_ms, vc_members))
 
             if mp.manual_stop:
                 mp.manual_stop = False
-                bot.loop.create_task(
+                spawn(
                     play_audio(guild_id, is_a_loop=False, song_that_just_ended=finished)
                 )
                 return
@@ -1647,134 +1952,156 @@ async def play_audio(
 
             if mp.seek_info is not None:
                 st, mp.seek_info = mp.seek_info, None
-                bot.loop.create_task(play_audio(guild_id, seek_time=st, is_a_loop=True))
+                spawn(play_audio(guild_id, seek_time=st, is_a_loop=True))
                 return
 
             if mp.loop_current:
-                bot.loop.create_task(play_audio(guild_id, is_a_loop=True))
+                spawn(play_audio(guild_id, is_a_loop=True))
                 return
 
             mp.current_info = None
             if finished and state._24_7_mode and not mp.autoplay_enabled:
                 await mp.queue.put(create_queue_item_from_info(finished, guild_id))
 
-            bot.loop.create_task(
-                play_audio(guild_id, is_a_loop=False, song_that_just_ended=finished)
-            )
+            spawn(play_audio(guild_id, is_a_loop=False, song_that_just_ended=finished))
         except Exception as e:
             logger.error(
                 f"[{guild_id}] Exception in after_playing callback: {e}", exc_info=True
             )
             # Attempt recovery by queuing next song
             try:
-                bot.loop.create_task(
-                    play_audio(guild_id, is_a_loop=False, song_that_just_ended=None)
-                )
+                spawn(play_audio(guild_id, is_a_loop=False, song_that_just_ended=None))
             except Exception as recovery_error:
                 logger.critical(
                     f"[{guild_id}] Failed to recover from after_playing error: {recovery_error}",
                     exc_info=True,
                 )
 
+    def _after(error):
+        # Runs on the audio player thread — hand off to the loop thread-safely
+        asyncio.run_coroutine_threadsafe(after_playing(error), bot.loop)
+
     # ------------------------------------------------------------------
 
     try:
-        if not (is_a_loop or seek_time):
-            # Cancel lyrics
-            if mp.lyrics_task and not mp.lyrics_task.done():
-                mp.lyrics_task.cancel()
+        # Loop (instead of re-spawning play_audio) until a playable track is
+        # found; unresolvable or URL-less entries simply fall through.
+        while True:
+            if not (is_a_loop or seek_time):
+                # Cancel lyrics
+                if mp.lyrics_task and not mp.lyrics_task.done():
+                    mp.lyrics_task.cancel()
 
-            if mp.queue.empty():
-                await _handle_empty_queue(
-                    state, mp, guild_id, is_kw, song_that_just_ended
-                )
                 if mp.queue.empty():
-                    mp.current_task = None
-                    bot.loop.create_task(update_controller(bot, guild_id))
-                    if not state._24_7_mode:
-                        await asyncio.sleep(60)
-                        if (
-                            mp.voice_client
-                            and not mp.voice_client.is_playing()
-                            and len(mp.voice_client.channel.members) == 1
-                        ):
-                            await mp.voice_client.disconnect()
-                    return
-
-            next_item = await mp.queue.get()
-
-            if isinstance(next_item, LazySearchItem):
-                resolved = await next_item.resolve()
-                if not resolved or resolved.get("error"):
-                    ftitle = resolved.get("title", "unknown") if resolved else "unknown"
-                    logger.warning(
-                        f"[{guild_id}] Lazy resolve failed '{ftitle}', skipping."
+                    await _handle_empty_queue(
+                        state, mp, guild_id, is_kw, song_that_just_ended
                     )
-                    if mp.text_channel:
-                        try:
-                            await mp.text_channel.send(
-                                embed=Embed(
-                                    title=get_messages(
-                                        "lazy_resolve.error.title", guild_id
-                                    ),
-                                    description=get_messages(
-                                        "lazy_resolve.error.description",
-                                        guild_id,
-                                        title=ftitle,
-                                    ),
-                                    color=0xFF9AA2 if is_kw else discord.Color.red(),
-                                ),
-                                silent=SILENT_MESSAGES,
-                            )
-                        except discord.Forbidden:
-                            pass
-                    bot.loop.create_task(
-                        play_audio(guild_id, song_that_just_ended=mp.current_info)
-                    )
-                    return
-                next_item = resolved
+                    if mp.queue.empty():
+                        mp.current_task = None
+                        spawn(update_controller(bot, guild_id))
+                        if mp.idle_since is None:
+                            mp.idle_since = bot.loop.time()
+                        if not state._24_7_mode:
+                            # Wait out the idle window, but wake (and bail via
+                            # the check below) as soon as playback restarts
+                            mp.playback_event.clear()
+                            try:
+                                await asyncio.wait_for(
+                                    mp.playback_event.wait(), IDLE_DISCONNECT_DELAY
+                                )
+                            except asyncio.TimeoutError:
+                                pass
+                            # Only act if nothing has played since we went idle
+                            if (
+                                mp.idle_since is not None
+                                and bot.loop.time() - mp.idle_since
+                                >= IDLE_DISCONNECT_DELAY
+                                and mp.voice_client
+                                and not mp.voice_client.is_playing()
+                                and len(mp.voice_client.channel.members) == 1
+                            ):
+                                await mp.voice_client.disconnect()
+                        return
+
+                next_item = await mp.queue.get()
+
+                if isinstance(next_item, LazySearchItem):
+                    resolved = await next_item.resolve()
+                    if not resolved or resolved.get("error"):
+                        ftitle = (
+                            resolved.get("title", "unknown") if resolved else "unknown"
+                        )
+                        logger.warning(
+                            f"[{guild_id}] Lazy resolve failed '{ftitle}', skipping."
+                        )
+                        await _notify_skipped(mp, guild_id, is_kw, ftitle)
+                        song_that_just_ended = mp.current_info
+                        mp.current_info = None
+                        continue
+                    next_item = resolved
 
-            next_item.setdefault("requester", bot.user)
-            if next_item.pop("skip_now_playing", False):
-                mp.suppress_next_now_playing = True
+                next_item.setdefault("requester", bot.user)
+                if next_item.pop("skip_now_playing", False):
+                    mp.suppress_next_now_playing = True
 
-            mp.current_info = next_item
-            if not mp.loop_current:
-                mp.history.append(next_item)
+                mp.current_info = next_item
+                if not mp.loop_current:
+                    push_history(mp, next_item)
+                    remember_autoplay(mp, next_item)
 
-        if not (mp.voice_client and mp.voice_client.is_connected() and mp.current_info):
-            return
+            if not (
+                mp.voice_client and mp.voice_client.is_connected() and mp.current_info
+            ):
+                return
 
-        url_for_fetch = mp.current_info.get("webpage_url") or mp.current_info.get("url")
+            info = mp.current_info
+            url_for_fetch = info.get("webpage_url") or info.get("url")
 
-        # Refresh stream URL (skip for local files)
-        if mp.current_info.get("source_type") != "file":
-            # Check stream cache first
-            cached_stream = stream_url_cache.get(url_for_fetch)
-            if cached_stream and cached_stream.get("url"):
-                mp.current_info.update(cached_stream)
-            else:
-                for attempt in range(3):
-                    try:
-                        refreshed = await asyncio.wait_for(
-                            fetch_video_info_with_retry(url_for_fetch), timeout=15.0
-                        )
-                        mp.current_info.update(refreshed)
-                        stream_url = refreshed.get("url")
-                        if stream_url:
-                            stream_url_cache[url_for_fetch] = {"url": stream_url}
-                        break
-                    except asyncio.TimeoutError:
-                        if attempt == 2:
-                            raise
-                        await asyncio.sleep(1)
-
-        audio_url = mp.current_info.get("url")
-        if not audio_url:
-            bot.loop.create_task(
-                play_audio(guild_id, song_that_just_ended=mp.current_info)
-            )
-            return
+            # Refresh stream URL (skip for local files)
+            unplayable = False
+            if mp.current_info.get("source_type") != "file":
+                # Check stream cache first
+                cached_stream = stream_url_cache.get(url_for_fetch)
+                if cached_stream and cached_stream.get("url"):
+                    mp.current_info.update(cached_stream)
+                else:
+                    for attempt in range(3):
+                        try:
+                            refreshed = await asyncio.wait_for(
+                                fetch_video_info_with_retry(url_for_fetch), timeout=15.0
+                            )
+                            mp.current_info.update(refreshed)
+                            stream_url = refreshed.get("url")
+                            if stream_url:
+                                stream_url_cache[url_for_fetch] = {
+                                    "url": stream_url,
+                                    "acodec": refreshed.get("acodec"),
+                                }
+                            break
+                        except asyncio.TimeoutError:
+                            if attempt == 2:
+                                raise
+                            await asyncio.sleep(1)
+                        except yt_dlp.utils.DownloadError as e:
+                            # Lazy items are queued from flat search hits, so a
+                            # removed/private/blocked video first fails here;
+                            # skip it rather than tearing down the session.
+                            ftitle = info.get("title", url_for_fetch)
+                            logger.warning(
+                                f"[{guild_id}] Unplayable '{ftitle}', skipping: {e}"
+                            )
+                            await _notify_skipped(mp, guild_id, is_kw, ftitle)
+                            unplayable = True
+                            break
+
+            audio_url = mp.current_info.get("url")
+            if audio_url and not unplayable:
+                break
+            is_a_loop, seek_time = False, 0
+            song_that_just_ended = mp.current_info
+            # Don't leave a skipped track looking "current" if the queue is
+            # now empty (controller, /nowplaying, saved state, rejoin)
+            mp.current_info = None
 
         mp.is_current_live = (
             mp.current_info.get("is_live", False)
@@ -1797,10 +2124,27 @@ async def play_audio(
         if filter_chain:
             ff["options"] = f"{ff['options']} -af {filter_chain}"
 
-        source = discord.PCMVolumeTransformer(
-            discord.FFmpegPCMAudio(audio_url, **ff),
-            volume=mp.volume,
-        )
+        # Opus source, no filters, unity volume: hand packets straight to
+        # Discord instead of decoding to PCM and re-encoding every frame.
+        # At unity volume the per-frame PCMVolumeTransformer is skipped too;
+        # apply_volume() restarts the stream if the volume is changed later,
+        # which needs a seek; live streams can't seek, so they always keep
+        # the transformer.
+        unity = mp.volume == 1.0 and not mp.is_current_live
+        if (
+            not filter_chain
+            and unity
+            and mp.current_info.get("acodec") == "opus"
+            and mp.current_info.get("source_type") != "file"
+        ):
+            source = discord.FFmpegOpusAudio(audio_url, codec="copy", **ff)
+        elif unity:
+            source = discord.FFmpegPCMAudio(audio_url, **ff)
+        else:
+            source = discord.PCMVolumeTransformer(
+                discord.FFmpegPCMAudio(audio_url, **ff),
+                volume=mp.volume,
+            )
 
         if not (mp.voice_client and mp.voice_client.is_connected()):
             return
@@ -1811,9 +2155,7 @@ async def play_audio(
             await asyncio.sleep(0.2)
 
         try:
-            mp.voice_client.play(
-                source, after=lambda e: bot.loop.create_task(after_playing(e))
-            )
+            mp.voice_client.play(source, after=_after)
         except discord.errors.ClientException as e:
             if "Already playing audio" in str(e):
                 logger.warning(
@@ -1822,16 +2164,16 @@ async def play_audio(
                 mp.voice_client.stop()
                 await asyncio.sleep(0.5)
                 try:
-                    mp.voice_client.play(
-                        source, after=lambda e: bot.loop.create_task(after_playing(e))
-                    )
+                    mp.voice_client.play(source, after=_after)
                 except Exception as retry_error:
                     logger.error(f"[{guild_id}] Retry failed: {retry_error}")
                     return
             else:
                 raise
         mp.start_time = seek_time
-        mp.playback_started_at = time.time()
+        mp.playback_started_at = time.monotonic()
+        mp.idle_since = None
+        mp.playback_event.set()
 
         # Voice channel status (debounced)
         # Cek apakah ini lagu baru (bukan sekadar resume dari loop/seek lagu yg sama)
@@ -1848,7 +2190,11 @@ async def play_audio(
                 clean_a and not artist_in_title and clean_a.lower() != "unknown artist"
             )
             status = f"🎶 {clean_t}" + (f" - {clean_a}" if show_artist else "")
-            bot.loop.create_task(update_voice_channel_status(guild_id, status[:476]))
+            spawn(update_voice_channel_status(guild_id, status[:476]))
+
+            # Warm the next item so the following transition skips extraction
+            cancel_prefetch(mp)
+            mp.prefetch_task = bot.loop.create_task(_prefetch_next(guild_id, mp))
 
         # Controller re-anchor check (only on new songs)
         if state.controller_channel_id and not is_a_loop and not seek_time:
@@ -1858,14 +2204,14 @@ async def play_audio(
                     ch = bot.get_channel(ch_id)
                     if ch and ch.last_message_id != msg_id:
                         try:
-                            await (await ch.fetch_message(msg_id)).delete()
-                        except Exception:
+                            await ch.get_partial_message(msg_id).delete()
+                        except discord.HTTPException:
                             pass
                         state.controller_message_id = None
                 except Exception:
                     pass
 
-        bot.loop.create_task(update_controller(bot, guild_id))
+        spawn(update_controller(bot, guild_id))
 
         if mp.suppress_next_now_playing:
             mp.suppress_next_now_playing = False
@@ -1874,6 +2220,25 @@ async def play_audio(
         await handle_playback_error(guild_id, e)
 
 
+async def _notify_skipped(mp: MusicPlayer, guild_id: int, is_kw: bool, title: str):
+    """Tell the text channel that an unplayable track was skipped."""
+    if not mp.text_channel:
+        return
+    try:
+        await mp.text_channel.send(
+            embed=Embed(
+                title=get_messages("lazy_resolve.error.title", guild_id),
+                description=get_messages(
+                    "lazy_resolve.error.description", guild_id, title=title
+                ),
+                color=0xFF9AA2 if is_kw else discord.Color.red(),
+            ),
+            silent=SILENT_MESSAGES,
+        )
+    except discord.Forbidden:
+        pass
+
+
 async def _handle_empty_queue(state, mp, guild_id, is_kw, song_that_just_ended):
     # Mode 24/7 tanpa autoplay: putar ulang radio playlist
     if state._24_7_mode and not mp.autoplay_enabled and mp.radio_playlist:
@@ -1886,6 +2251,72 @@ async def _handle_empty_queue(state, mp, guild_id, is_kw, song_that_just_ended):
         await _run_autoplay(state, mp, guild_id, is_kw, song_that_just_ended)
 
 
+def _norm_title(title: Optional[str]) -> str:
+    return (title or "").casefold().strip()
+
+
+def _rec_key(entry: dict) -> str:
+    u = entry.get("webpage_url") or entry.get("url") or ""
+    return get_video_id(u) or u
+
+
+def remember_autoplay(mp: MusicPlayer, info: dict):
+    """Record a started track in the bounded recently-played index."""
+    title = _norm_title(info.get("title"))
+    if not title:
+        return
+    mp.autoplay_history[title] = _rec_key(info)
+    mp.autoplay_history.move_to_end(title)
+    while len(mp.autoplay_history) > AUTOPLAY_HISTORY_MAX:
+        mp.autoplay_history.popitem(last=False)
+
+
+def _autoplay_duration_ok(duration) -> bool:
+    # Unknown durations pass; skips shorts/intros and hour-long compilations
+    if not duration:
+        return True
+    return AUTOPLAY_MIN_DURATION <= duration <= AUTOPLAY_MAX_DURATION
+
+
+def _autoplay_seen(mp: MusicPlayer) -> tuple[set, set]:
+    """Video-id/URL and normalised-title sets for recent plays + queue."""
+    urls = set(mp.autoplay_history.values())
+    titles = set(mp.autoplay_history)
+    for t in mp.queue._queue:
+        if isinstance(t, LazySearchItem):
+            t = t.resolved_info or {"title": t.title}
+        if key := _rec_key(t):
+            urls.add(key)
+        if title := t.get("title"):
+            titles.add(_norm_title(title))
+    return urls, titles
+
+
+async def _fetch_autoplay_recs(seed_url: str) -> list:
+    """Raw mix/station entries for a YouTube or SoundCloud seed."""
+    if "youtube.com" in seed_url or "youtu.be" in seed_url:
+        mix_url = get_mix_playlist_url(seed_url)
+        if mix_url:
+            info = await run_ydl_with_low_priority(
+                {"extract_flat": True, "quiet": True, "noplaylist": False}, mix_url
+            )
+            cur_vid = get_video_id(seed_url)
+            return [
+                e
+                for e in info.get("entries", [])
+                if e and get_video_id(e.get("url", "")) != cur_vid
+            ]
+    elif "soundcloud.com" in seed_url:
+        tid = await get_soundcloud_track_id(seed_url)
+        stn_url = get_soundcloud_station_url(tid)
+        if stn_url:
+            info = await run_ydl_with_low_priority(
+                {"extract_flat": True, "quiet": True, "noplaylist": False}, stn_url
+            )
+            return info.get("entries", [])[1:]
+    return []
+
+
 async def _run_autoplay(
     state: GuildModel, mp: MusicPlayer, guild_id: int, is_kw: bool, song_that_just_ended
 ):
@@ -1896,7 +2327,7 @@ async def _run_autoplay(
     seed_src = song_that_just_ended or (mp.history[-1] if mp.history else None)
     if seed_src:
         candidate = seed_src.get("webpage_url") or seed_src.get("url", "")
-        if any(s in candidate for s in ["youtube.com", "youtu.be", "soundcloud.com"]):
+        if is_autoplay_seed(candidate):
             seed_url = candidate
         else:
             # Walk history to find a YouTube/SC URL
@@ -1907,9 +2338,7 @@ async def _run_autoplay(
             )
             for track in reversed(src_list):
                 fb = track.get("webpage_url") or track.get("url", "")
-                if fb and any(
-                    s in fb for s in ["youtube.com", "youtu.be", "soundcloud.com"]
-                ):
+                if fb and is_autoplay_seed(fb):
                     seed_url = fb
                     break
 
@@ -1917,6 +2346,8 @@ async def _run_autoplay(
         return
 
     added = 0
+    # Start the (slow) recommendation fetch while the progress embed is sent
+    recs_task = asyncio.create_task(_fetch_autoplay_recs(seed_url))
     try:
         if mp.text_channel:
             initial = Embed(
@@ -1930,56 +2361,37 @@ async def _run_autoplay(
                 embed=initial, silent=SILENT_MESSAGES
             )
 
-        recs = []
-        if "youtube.com" in seed_url or "youtu.be" in seed_url:
-            mix_url = get_mix_playlist_url(seed_url)
-            if mix_url:
-                info = await run_ydl_with_low_priority(
-                    {"extract_flat": True, "quiet": True, "noplaylist": False}, mix_url
-                )
-                cur_vid = get_video_id(seed_url)
-                recs = [
-                    e
-                    for e in info.get("entries", [])
-                    if e and get_video_id(e.get("url", "")) != cur_vid
-                ][:10]
-        elif "soundcloud.com" in seed_url:
-            tid = await get_soundcloud_track_id(seed_url)
-            stn_url = get_soundcloud_station_url(tid)
-            if stn_url:
-                info = await run_ydl_with_low_priority(
-                    {"extract_flat": True, "quiet": True, "noplaylist": False}, stn_url
-                )
-                recs = info.get("entries", [])[1:11]
-
-        if recs:
-            orig_req = seed_src.get("requester", bot.user) if seed_src else bot.user
-            total = len(recs)
-            for i, e in enumerate(recs):
-                await mp.queue.put(
-                    {
-                        "url": e.get("url"),
-                        "title": e.get("title", "Unknown Title"),
-                        "webpage_url": e.get("webpage_url", e.get("url")),
-                        "is_single": True,
-                        "requester": orig_req,
-                    }
-                )
-                added += 1
-                if progress_msg and ((i + 1) % 5 == 0 or (i + 1) == total):
-                    emb = progress_msg.embeds[0]
-                    emb.description = get_messages(
-                        "autoplay_loading_description", guild_id
-                    ).format(
-                        progress_bar=create_loading_bar((i + 1) / total),
-                        processed=added,
-                        total=total,
-                    )
-                    await progress_msg.edit(embed=emb)
-                    await asyncio.sleep(0.3)
+        recs = await recs_task
+
+        # Cheap filters first (duration, already played/queued), stop at 10
+        seen_urls, seen_titles = _autoplay_seen(mp)
+        orig_req = seed_src.get("requester", bot.user) if seed_src else bot.user
+        for e in recs:
+            if added >= 10:
+                break
+            if not e or not _autoplay_duration_ok(e.get("duration")):
+                continue
+            key, title = _rec_key(e), _norm_title(e.get("title"))
+            if key in seen_urls or title in seen_titles:
+                continue
+            seen_urls.add(key)
+            seen_titles.add(title)
+            await mp.queue.put(
+                {
+                    "url": e.get("url"),
+                    "title": e.get("title", "Unknown Title"),
+                    "webpage_url": e.get("webpage_url", e.get("url")),
+                    "duration": e.get("duration"),
+                    "is_single": True,
+                    "requester": orig_req,
+                }
+            )
+            added += 1
     except Exception as e:
         logger.error(f"Autoplay error: {e}", exc_info=True)
     finally:
+        if not recs_task.done():
+            recs_task.cancel()
         if progress_msg:
             if added:
                 emb = progress_msg.embeds[0]
@@ -1993,17 +2405,17 @@ async def _run_autoplay(
                 await progress_msg.delete()
 
 
+def _extract_track_id(url: str) -> Optional[str]:
+    with yt_dlp.YoutubeDL({"quiet": True}) as ydl:
+        return ydl.extract_info(url, download=False).get("id")
+
+
 async def get_soundcloud_track_id(url):
     if "soundcloud.com" not in url:
         return None
     try:
         loop = asyncio.get_running_loop()
-
-        def _get_id():
-            with yt_dlp.YoutubeDL({"quiet": True}) as ydl:
-                return ydl.extract_info(url, download=False).get("id")
-
-        return await loop.run_in_executor(None, _get_id)
+        return await loop.run_in_executor(_YTDL_POOL, _extract_track_id, url)
     except Exception:
         return None
 
@@ -2035,7 +2447,7 @@ async def update_karaoke_task(guild_id: int):
             if not mp.playback_started_at:
                 await asyncio.sleep(0.5)
                 continue
-            elapsed_real = time.time() - mp.playback_started_at
+            elapsed_real = time.monotonic() - mp.playback_started_at
             eff_time = mp.start_time + elapsed_real * mp.playback_speed
             cur_i = -1
             for i, line in enumerate(mp.synced_lyrics):
@@ -2072,6 +2484,114 @@ async def update_karaoke_task(guild_id: int):
     mp.lyrics_task = mp.lyrics_message = None
 
 
+# ════════════════════════════════════════════════════════════════════════════
+# ▌ SPOTIFY WEB API - Shared Session + Token Cache
+# ════════════════════════════════════════════════════════════════════════════
+SPOTIFY_CLIENT_ID = os.getenv("SPOTIFY_CLIENT_ID")
+SPOTIFY_CLIENT_SECRET = os.getenv("SPOTIFY_CLIENT_SECRET")
+SPOTIFY_API_BASE = "https://api.spotify.com/v1"
+SPOTIFY_TOKEN_URL = "https://accounts.spotify.com/api/token"
+
+_http_session: Optional[aiohttp.ClientSession] = None
+_spotify_token: Optional[str] = None
+_spotify_token_expires_at = 0.0
+_spotify_token_lock = asyncio.Lock()
+# App tokens are limited to roughly 25 req/s; cap concurrency as well.
+_spotify_limiter = AsyncLimiter(25, 1)
+_spotify_sem = asyncio.Semaphore(10)
+SPOTIFY_MAX_RETRIES = 3
+
+
+def spotify_api_enabled() -> bool:
+    return bool(
+        SPOTIFY_CLIENT_ID
+        and SPOTIFY_CLIENT_SECRET
+        and SPOTIFY_CLIENT_ID != "your_spotify_client_id"
+    )
+
+
+def get_http_session() -> aiohttp.ClientSession:
+    """Process-wide aiohttp session (created lazily inside the running loop)."""
+    global _http_session
+    if _http_session is None or _http_session.closed:
+        _http_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=20,
+                limit_per_host=20,
+                keepalive_timeout=75,
+                ttl_dns_cache=300,
+                enable_cleanup_closed=True,
+            ),
+            timeout=aiohttp.ClientTimeout(total=10),
+        )
+    return _http_session
+
+
+async def _get_spotify_token() -> str:
+    """Client-credentials token; refreshed only within 60 s of expiry."""
+    global _spotify_token, _spotify_token_expires_at
+    async with _spotify_token_lock:
+        if _spotify_token and time.monotonic() < _spotify_token_expires_at - 60:
+            return _spotify_token
+        async with _spotify_limiter, get_http_session().post(
+            SPOTIFY_TOKEN_URL,
+            data={"grant_type": "client_credentials"},
+            auth=aiohttp.BasicAuth(SPOTIFY_CLIENT_ID, SPOTIFY_CLIENT_SECRET),
+        ) as resp:
+            resp.raise_for_status()
+            d = await resp.json()
+        _spotify_token = d["access_token"]
+        _spotify_token_expires_at = time.monotonic() + d.get("expires_in", 3600)
+        return _spotify_token
+
+
+async def spotify_api_get(path: str, params: Optional[dict] = None) -> dict:
+    """GET a Web API path (or an absolute `next` URL) with the cached token."""
+    url = path if path.startswith("http") else f"{SPOTIFY_API_BASE}{path}"
+    for attempt in range(SPOTIFY_MAX_RETRIES + 1):
+        token = await _get_spotify_token()
+        async with _spotify_limiter, _spotify_sem:
+            async with get_http_session().get(
+                url, params=params, headers={"Authorization": f"Bearer {token}"}
+            ) as resp:
+                if resp.status != 429 or attempt == SPOTIFY_MAX_RETRIES:
+                    resp.raise_for_status()
+                    return await resp.json()
+                retry_after = float(resp.headers.get("Retry-After", "1"))
+        # Sleep outside the gate so other requests aren't blocked by the slot.
+        logger.warning(f"Spotify rate limited, retrying in {retry_after}s")
+        await asyncio.sleep(retry_after)
+
+
+async def fetch_spotify_tracks(kind: str, spotify_id: str) -> list:
+    """Return [(name, artist), ...] for a track, album or playlist id."""
+
+    def _pair(t: dict) -> tuple:
+        artist = (t.get("artists") or [{}])[0].get("name", "Unknown Artist")
+        return t.get("name", "Unknown"), artist
+
+    if kind == "track":
+        return [_pair(await spotify_api_get(f"/tracks/{spotify_id}"))]
+
+    if kind == "album":
+        nxt, params = f"/albums/{spotify_id}/tracks", {"limit": 50}
+    else:
+        nxt, params = f"/playlists/{spotify_id}/tracks", {
+            "limit": 100,
+            "fields": "items(track(name,artists(name))),next",
+        }
+
+    tracks = []
+    while nxt:
+        d = await spotify_api_get(nxt, params)
+        for item in d.get("items", []):
+            t = item.get("track") if kind == "playlist" else item
+            if t and t.get("name"):
+                tracks.append(_pair(t))
+        nxt, params = d.get("next"), None  # `next` already carries the query
+    return tracks
+
+
 # ════════════════════════════════════════════════════════════════════════════
 # ▌ PLATFORM URL PROCESSORS
 # ════════════════════════════════════════════════════════════════════════════
@@ -2084,12 +2604,21 @@ async def process_spotify_url(url, interaction):
     clean_url = url.split("?")[0]
     loop = asyncio.get_running_loop()
 
+    parsed = parse_spotify_url(clean_url)
+    if parsed and spotify_api_enabled():
+        try:
+            tracks = await fetch_spotify_tracks(*parsed)
+            if tracks:
+                return tracks
+        except Exception as e:
+            logger.error(f"Spotify Web API failed, using scraper: {e}")
+
     if spotify_scraper_client:
         try:
             tracks = []
             if "playlist" in clean_url:
                 d = await loop.run_in_executor(
-                    None, lambda: spotify_scraper_client.get_playlist_info(clean_url)
+                    _SPOTIFY_POOL, spotify_scraper_client.get_playlist_info, clean_url
                 )
                 for t in d.get("tracks", []):
                     artist_name = (t.get("artists") or [{}])[0].get(
@@ -2098,7 +2627,7 @@ async def process_spotify_url(url, interaction):
                     tracks.append((t.get("name", "Unknown"), artist_name))
             elif "album" in clean_url:
                 d = await loop.run_in_executor(
-                    None, lambda: spotify_scraper_client.get_album_info(clean_url)
+                    _SPOTIFY_POOL, spotify_scraper_client.get_album_info, clean_url
                 )
                 for t in d.get("tracks", []):
                     artist_name = (t.get("artists") or [{}])[0].get(
@@ -2107,7 +2636,7 @@ async def process_spotify_url(url, interaction):
                     tracks.append((t.get("name", "Unknown"), artist_name))
             elif "track" in clean_url:
                 d = await loop.run_in_executor(
-                    None, lambda: spotify_scraper_client.get_track_info(clean_url)
+                    _SPOTIFY_POOL, spotify_scraper_client.get_track_info, clean_url
                 )
                 artist_name = (d.get("artists") or [{}])[0].get(
                     "name", "Unknown Artist"
@@ -2129,13 +2658,10 @@ async def process_spotify_url(url, interaction):
 async def process_deezer_url(url, interaction):
     guild_id = interaction.guild.id
     try:
-        share_re = re.compile(r"^(https?://)?(link\.deezer\.com)/s/.+$")
-        if share_re.match(url):
-            async with aiohttp.ClientSession() as session:
-                async with session.head(
-                    url, allow_redirects=True, timeout=aiohttp.ClientTimeout(total=10)
-                ) as resp:
-                    url = str(resp.url)
+        session = get_http_session()
+        if DEEZER_SHARE_REGEX.match(url):
+            async with session.head(url, allow_redirects=True) as resp:
+                url = str(resp.url)
 
         parsed = urlparse(url)
         parts = parsed.path.strip("/").split("/")
@@ -2144,38 +2670,32 @@ async def process_deezer_url(url, interaction):
         rtype, rid = parts[0], parts[1].split("?")[0]
         base = "https://api.deezer.com"
         tracks = []
-        timeout = aiohttp.ClientTimeout(total=10)
 
-        async with aiohttp.ClientSession() as session:
-            if rtype == "track":
-                async with session.get(f"{base}/track/{rid}", timeout=timeout) as resp:
-                    d = await resp.json()
-                tracks.append((d["title"], d["artist"]["name"]))
-
-            elif rtype == "playlist":
-                nxt = f"{base}/playlist/{rid}/tracks"
-                while nxt:
-                    async with session.get(nxt, timeout=timeout) as resp:
-                        d = await resp.json()
-                    for t in d["data"]:
-                        tracks.append((t["title"], t["artist"]["name"]))
-                    nxt = d.get("next")
-
-            elif rtype == "album":
-                async with session.get(
-                    f"{base}/album/{rid}/tracks", timeout=timeout
-                ) as resp:
-                    d = await resp.json()
-                for t in d["data"]:
-                    tracks.append((t["title"], t["artist"]["name"]))
+        if rtype == "track":
+            async with session.get(f"{base}/track/{rid}") as resp:
+                d = await resp.json()
+            tracks.append((d["title"], d["artist"]["name"]))
 
-            elif rtype == "artist":
-                async with session.get(
-                    f"{base}/artist/{rid}/top?limit=10", timeout=timeout
-                ) as resp:
+        elif rtype == "playlist":
+            nxt = f"{base}/playlist/{rid}/tracks"
+            while nxt:
+                async with session.get(nxt) as resp:
                     d = await resp.json()
                 for t in d["data"]:
                     tracks.append((t["title"], t["artist"]["name"]))
+                nxt = d.get("next")
+
+        elif rtype == "album":
+            async with session.get(f"{base}/album/{rid}/tracks") as resp:
+                d = await resp.json()
+            for t in d["data"]:
+                tracks.append((t["title"], t["artist"]["name"]))
+
+        elif rtype == "artist":
+            async with session.get(f"{base}/artist/{rid}/top?limit=10") as resp:
+                d = await resp.json()
+            for t in d["data"]:
+                tracks.append((t["title"], t["artist"]["name"]))
 
         return tracks if tracks else None
     except Exception as e:
@@ -2561,7 +3081,7 @@ class MusicControllerView(View):
         if vc.is_playing() and mp.playback_started_at:
             cur_pos = (
                 mp.start_time
-                + (time.time() - mp.playback_started_at) * mp.playback_speed
+                + (time.monotonic() - mp.playback_started_at) * mp.playback_speed
             )
         elif vc.is_paused():
             cur_pos = mp.start_time
@@ -2599,12 +3119,13 @@ class MusicControllerView(View):
         if vc.is_paused():
             vc.resume()
             if mp.playback_started_at is None:
-                mp.playback_started_at = time.time()
+                mp.playback_started_at = time.monotonic()
+            await apply_volume(mp)  # volume may have changed while paused
         else:
             vc.pause()
             if mp.playback_started_at:
                 mp.start_time += (
-                    time.time() - mp.playback_started_at
+                    time.monotonic() - mp.playback_started_at
                 ) * mp.playback_speed
                 mp.playback_started_at = None
         await update_controller(self.bot_ref, interaction.guild_id)
@@ -2633,6 +3154,7 @@ class MusicControllerView(View):
             await safe_stop(vc)
             if mp.current_task and not mp.current_task.done():
                 mp.current_task.cancel()
+            release_player(mp)
             await vc.disconnect()
             clear_audio_cache(gid)
             get_guild_state(gid).music_player = MusicPlayer()
@@ -2689,10 +3211,8 @@ class MusicControllerView(View):
     )
     async def vol_down_button(self, interaction, button):
         mp = get_player(interaction.guild_id)
-        mp.volume = max(0.0, mp.volume - 0.1)
-        vc = interaction.guild.voice_client
-        if vc and vc.source and isinstance(vc.source, discord.PCMVolumeTransformer):
-            vc.source.volume = mp.volume
+        mp.volume = round(max(0.0, mp.volume - 0.1), 2)
+        await apply_volume(mp)
         await update_controller(self.bot_ref, interaction.guild_id)
         await interaction.response.defer()
 
@@ -2701,10 +3221,8 @@ class MusicControllerView(View):
     )
     async def vol_up_button(self, interaction, button):
         mp = get_player(interaction.guild_id)
-        mp.volume = min(2.0, mp.volume + 0.1)
-        vc = interaction.guild.voice_client
-        if vc and vc.source and isinstance(vc.source, discord.PCMVolumeTransformer):
-            vc.source.volume = mp.volume
+        mp.volume = round(min(2.0, mp.volume + 0.1), 2)
+        await apply_volume(mp)
         await update_controller(self.bot_ref, interaction.guild_id)
         await interaction.response.defer()
 
@@ -2757,6 +3275,14 @@ class MusicControllerView(View):
 # ════════════════════════════════════════════════════════════════════════════
 
 
+def _queue_display_line(item) -> str:
+    di = get_track_display_info(item)
+    title = di.get("title", "")
+    if di.get("source_type") in ("lazy", "file"):
+        return f"`{title}`"
+    return f"[{title}]({di.get('webpage_url','#')})"
+
+
 class QueueView(View):
     def __init__(self, interaction, tracks, items_per_page=5):
         super().__init__(timeout=300.0)
@@ -2792,7 +3318,7 @@ class QueueView(View):
         if self.message:
             try:
                 await self.message.delete()
-            except Exception:
+            except discord.HTTPException:
                 pass
 
     async def _prev(self, interaction):
@@ -2882,24 +3408,18 @@ class QueueView(View):
                 if isinstance(t, dict) and t.get("url") in url_cache:
                     t.update(url_cache[t["url"]])
 
-        lines = []
-        for i, item in enumerate(page_tracks, start=si):
-            di = get_track_display_info(item)
-            title = di.get("title", "")
-            if di.get("source_type") in ("lazy", "file"):
-                line = f"`{title}`"
-            else:
-                line = f"[{title}]({di.get('webpage_url','#')})"
-            lines.append(
-                get_messages(
-                    "queue.track_line.full_format", gid, i=i + 1, display_line=line
-                )
-            )
-
-        if lines:
+        if page_tracks:
             embed.add_field(
                 name=get_messages("queue_next", gid),
-                value="\n".join(lines),
+                value="\n".join(
+                    get_messages(
+                        "queue.track_line.full_format",
+                        gid,
+                        i=i + 1,
+                        display_line=_queue_display_line(item),
+                    )
+                    for i, item in enumerate(page_tracks, start=si)
+                ),
                 inline=False,
             )
         embed.set_footer(
@@ -2944,7 +3464,7 @@ class RemoveSelect(discord.ui.Select):
         for item in q:
             await nq.put(item)
         mp.queue = nq
-        bot.loop.create_task(update_controller(bot, gid))
+        spawn(update_controller(bot, gid))
         self.view.clear_items()
         await interaction.response.edit_message(
             content=get_messages("remove_processed", gid), embed=None, view=self.view
@@ -3046,7 +3566,7 @@ class JumpToSelect(discord.ui.Select):
             q = list(mp.queue._queue)
             if not 0 <= idx < len(q):
                 return await interaction.response.defer()
-            mp.history.extend(q[:idx])
+            push_history(mp, *q[:idx])
             nq = asyncio.Queue(maxsize=5000)
             for item in q[idx:]:
                 await nq.put(item)
@@ -3150,7 +3670,8 @@ class SeekView(View):
         if self.mp.playback_started_at:
             return int(
                 self.mp.start_time
-                + (time.time() - self.mp.playback_started_at) * self.mp.playback_speed
+                + (time.monotonic() - self.mp.playback_started_at)
+                * self.mp.playback_speed
             )
         return int(self.mp.start_time)
 
@@ -3217,7 +3738,7 @@ class SeekView(View):
                 c.disabled = True
             try:
                 await self.message.edit(view=self)
-            except Exception:
+            except discord.HTTPException:
                 pass
 
 
@@ -3247,7 +3768,6 @@ class SearchSelect(discord.ui.Select):
         gid = interaction.guild_id
         state = get_guild_state(gid)
         mp = state.music_player
-        is_kw = state.locale == Locale.EN_X_KAWAII
         url = self.values[0]
         self.disabled = True
         self.placeholder = get_messages("search_selection_made", gid)
@@ -3274,10 +3794,7 @@ class SearchSelect(discord.ui.Select):
         except Exception as e:
             logger.error(f"Search select callback error: {e}")
             await interaction.followup.send(
-                embed=Embed(
-                    description=get_messages("player.error.add_failed", gid),
-                    color=0xFF9AA2 if is_kw else discord.Color.red(),
-                ),
+                embed=error_embed("player.error.add_failed", gid),
                 silent=True,
                 ephemeral=True,
             )
@@ -3338,7 +3855,7 @@ class FilterView(View):
             elapsed = 0
             if mp.playback_started_at:
                 elapsed = (
-                    time.time() - mp.playback_started_at
+                    time.monotonic() - mp.playback_started_at
                 ) * old_speed + mp.start_time
             mp.playback_speed = get_speed_multiplier_from_filters(af)
             mp.is_seeking, mp.seek_info = True, elapsed
@@ -3420,7 +3937,7 @@ class RefineLyricsModal(discord.ui.Modal):
             )
         loop = asyncio.get_running_loop()
         song = await loop.run_in_executor(
-            None, lambda: genius.search_song(self.query.value)
+            _LYRICS_POOL, genius.search_song, self.query.value
         )
         if not song:
             return await interaction.followup.send(
@@ -3509,7 +4026,9 @@ class KaraokeRetryModal(discord.ui.Modal):
         lrc = None
         try:
             lrc = await asyncio.wait_for(
-                loop.run_in_executor(None, syncedlyrics.search, self.query.value),
+                loop.run_in_executor(
+                    _LYRICS_POOL, syncedlyrics.search, self.query.value
+                ),
                 timeout=10.0,
             )
         except Exception:
@@ -3582,7 +4101,7 @@ class _LyricsRetryModal(discord.ui.Modal):
             )
         loop = asyncio.get_running_loop()
         song = await loop.run_in_executor(
-            None, lambda: genius.search_song(self.query.value)
+            _LYRICS_POOL, genius.search_song, self.query.value
         )
         if not song:
             return await interaction.followup.send(
@@ -3680,7 +4199,7 @@ async def fetch_and_display_genius_lyrics(interaction, fallback_message=None):
 
     try:
         res = await loop.run_in_executor(
-            None, lambda: genius.search_songs(query, per_page=5)
+            _LYRICS_POOL, functools.partial(genius.search_songs, query, per_page=5)
         )
         hits = res.get("hits", []) if res else []
         if not hits:
@@ -3698,7 +4217,7 @@ async def fetch_and_display_genius_lyrics(interaction, fallback_message=None):
 
         info = hits[0]["result"]
         song = await loop.run_in_executor(
-            None, lambda: genius.search_song(song_id=info["id"])
+            _LYRICS_POOL, functools.partial(genius.search_song, song_id=info["id"])
         )
         if not song or not song.lyrics:
             raise ValueError("No lyrics")
@@ -3726,7 +4245,7 @@ async def fetch_and_display_genius_lyrics(interaction, fallback_message=None):
 async def play_autocomplete(
     interaction, current: str
 ) -> list[app_commands.Choice[str]]:
-    if not current or len(current) < 3 or re.match(r"https?://", current):
+    if not current or len(current) < 3 or URL_SCHEME_REGEX.match(current):
         return []
     try:
         prefix = "ytsearch10:"
@@ -3754,6 +4273,15 @@ async def play_autocomplete(
         return []
 
 
+PLATFORM_PROCESSORS = (
+    (SPOTIFY_REGEX, process_spotify_url, "Spotify"),
+    (DEEZER_REGEX, process_deezer_url, "Deezer"),
+    (APPLE_MUSIC_REGEX, process_apple_music_url, "Apple Music"),
+    (TIDAL_REGEX, process_tidal_url, "Tidal"),
+    (AMAZON_MUSIC_REGEX, process_amazon_music_url, "Amazon Music"),
+)
+
+
 @bot.tree.command(name="play", description="Play a link or search for a song")
 @app_commands.describe(query="Link or title of the song/video to play")
 @app_commands.autocomplete(query=play_autocomplete)
@@ -3771,7 +4299,32 @@ async def play(interaction: discord.Interaction, query: str):
     if not interaction.response.is_done():
         await interaction.response.defer()
 
-    vc = await ensure_voice_connection(interaction)
+    def keyword_search():
+        prefix = "scsearch:" if IS_PUBLIC_VERSION else "ytsearch:"
+        return asyncio.ensure_future(
+            fetch_video_info_with_retry(
+                f"{prefix}{sanitize_query(query)}",
+                {"noplaylist": True, "extract_flat": "in_playlist"},
+            )
+        )
+
+    # Plain-text searches don't depend on the voice channel, so run the
+    # search concurrently with the voice handshake. The extraction is shielded
+    # and can't be cancelled, so only start it if the connect can succeed.
+    voice = getattr(interaction.user, "voice", None)
+    search_task = (
+        keyword_search() if "/" not in query and voice and voice.channel else None
+    )
+
+    vc = None
+    try:
+        vc = await ensure_voice_connection(interaction)
+    finally:
+        # No voice client (returned None or raised): drop the search and
+        # retrieve its outcome so the loop doesn't log an unretrieved error
+        if not vc and search_task:
+            search_task.cancel()
+            await asyncio.gather(search_task, return_exceptions=True)
     if not vc:
         return
 
@@ -3780,7 +4333,9 @@ async def play(interaction: discord.Interaction, query: str):
             "url": info.get("webpage_url", info.get("url", "#")),
             "title": info.get("title", "Unknown Title"),
             "webpage_url": info.get("webpage_url", info.get("url", "#")),
-            "thumbnail": info.get("thumbnail"),
+            # Flat search entries only carry a `thumbnails` list
+            "thumbnail": info.get("thumbnail")
+            or (info.get("thumbnails") or [{}])[-1].get("url"),
             "is_single": True,
             "requester": interaction.user,
         }
@@ -3820,80 +4375,73 @@ async def play(interaction: discord.Interaction, query: str):
         await interaction.followup.send(embed=embed, silent=SILENT_MESSAGES)
         if not (vc.is_playing() or vc.is_paused()):
             mp.current_task = asyncio.create_task(play_audio(gid))
-        bot.loop.create_task(update_controller(bot, gid))
+        spawn(update_controller(bot, gid))
 
     try:
-        # Platform detection
-        processors = [
-            (SPOTIFY_REGEX, process_spotify_url, "Spotify"),
-            (DEEZER_REGEX, process_deezer_url, "Deezer"),
-            (APPLE_MUSIC_REGEX, process_apple_music_url, "Apple Music"),
-            (TIDAL_REGEX, process_tidal_url, "Tidal"),
-            (AMAZON_MUSIC_REGEX, process_amazon_music_url, "Amazon Music"),
-        ]
-        for regex, processor, platform in processors:
-            if regex.match(query):
-                tracks = await processor(query, interaction)
-                if not tracks:
+        # Platform detection / direct URLs (plain-text searches skip all regexes)
+        if "/" in query:
+            for regex, processor, platform in PLATFORM_PROCESSORS:
+                if regex.match(query):
+                    tracks = await processor(query, interaction)
+                    if not tracks:
+                        return
+                    if len(tracks) == 1:
+                        name, artist = tracks[0]
+                        # Selalu cari di YouTube Music
+                        prefix = "scsearch:" if IS_PUBLIC_VERSION else "ytsearch:"
+                        info = await fetch_video_info_with_retry(
+                            f"{prefix}{sanitize_query(f'{name} {artist} official')}",
+                            {"noplaylist": True, "extract_flat": "in_playlist"},
+                        )
+                        await add_single(
+                            info["entries"][0] if "entries" in info else info
+                        )
+                    else:
+                        await add_platform_playlist(tracks, platform)
                     return
-                if len(tracks) == 1:
-                    name, artist = tracks[0]
-                    # Selalu cari di YouTube Music
-                    prefix = "scsearch:" if IS_PUBLIC_VERSION else "ytsearch:"
-                    info = await fetch_video_info_with_retry(
-                        f"{prefix}{sanitize_query(f'{name} {artist} official')}",
-                        {"noplaylist": True},
+
+            # Direct URL (YouTube, SoundCloud, direct file link)
+            if (
+                YOUTUBE_REGEX.match(query)
+                or SOUNDCLOUD_REGEX.match(query)
+                or DIRECT_LINK_REGEX.match(query)
+            ):
+                info = await fetch_video_info_with_retry(
+                    query, {"extract_flat": True, "noplaylist": False}
+                )
+                if "entries" in info and len(info["entries"]) > 1:
+                    # Limit playlist additions to prevent unbounded queue growth (max 5000 items)
+                    entries_to_add = info["entries"]
+
+                    for e in entries_to_add:
+                        await mp.queue.put(
+                            {
+                                "url": e.get("url"),
+                                "title": e.get("title", "Unknown"),
+                                "webpage_url": e.get("webpage_url", e.get("url")),
+                                "thumbnail": e.get("thumbnail"),
+                                "duration": e.get("duration", 0),
+                                "requester": interaction.user,
+                                "is_single": False,
+                            }
+                        )
+                    embed = Embed(
+                        title=get_messages("playlist_added", gid),
+                        description=get_messages(
+                            "playlist_description", gid, count=len(info["entries"])
+                        ),
+                        color=0xB5EAD7 if is_kw else discord.Color.green(),
                     )
-                    await add_single(info["entries"][0] if "entries" in info else info)
+                    await interaction.followup.send(embed=embed, silent=SILENT_MESSAGES)
+                    if not (vc.is_playing() or vc.is_paused()):
+                        mp.current_task = asyncio.create_task(play_audio(gid))
                 else:
-                    await add_platform_playlist(tracks, platform)
+                    video = (info.get("entries") or [info])[0]
+                    await add_single(video)
                 return
 
-        # Direct URL (YouTube, SoundCloud, direct file link)
-        if (
-            YOUTUBE_REGEX.match(query)
-            or SOUNDCLOUD_REGEX.match(query)
-            or DIRECT_LINK_REGEX.match(query)
-        ):
-            info = await fetch_video_info_with_retry(
-                query, {"extract_flat": True, "noplaylist": False}
-            )
-            if "entries" in info and len(info["entries"]) > 1:
-                # Limit playlist additions to prevent unbounded queue growth (max 5000 items)
-                entries_to_add = info["entries"]
-
-                for e in entries_to_add:
-                    await mp.queue.put(
-                        {
-                            "url": e.get("url"),
-                            "title": e.get("title", "Unknown"),
-                            "webpage_url": e.get("webpage_url", e.get("url")),
-                            "thumbnail": e.get("thumbnail"),
-                            "duration": e.get("duration", 0),
-                            "requester": interaction.user,
-                            "is_single": False,
-                        }
-                    )
-                embed = Embed(
-                    title=get_messages("playlist_added", gid),
-                    description=get_messages(
-                        "playlist_description", gid, count=len(info["entries"])
-                    ),
-                    color=0xB5EAD7 if is_kw else discord.Color.green(),
-                )
-                await interaction.followup.send(embed=embed, silent=SILENT_MESSAGES)
-                if not (vc.is_playing() or vc.is_paused()):
-                    mp.current_task = asyncio.create_task(play_audio(gid))
-            else:
-                video = (info.get("entries") or [info])[0]
-                await add_single(video)
-            return
-
-        # Keyword search
-        prefix = "scsearch:" if IS_PUBLIC_VERSION else "ytsearch:"
-        info = await fetch_video_info_with_retry(
-            f"{prefix}{sanitize_query(query)}", {"noplaylist": True}
-        )
+        # Keyword search (also reached by non-URL text containing "/")
+        info = await (search_task or keyword_search())
         if not info.get("entries"):
             raise ValueError("No results")
         await add_single(info["entries"][0])
@@ -3908,10 +4456,7 @@ async def play(interaction: discord.Interaction, query: str):
             )
         except Exception:
             await interaction.followup.send(
-                embed=Embed(
-                    description=get_messages("search_error", gid),
-                    color=0xFF9AA2 if is_kw else discord.Color.red(),
-                ),
+                embed=error_embed("search_error", gid),
                 ephemeral=True,
                 silent=True,
             )
@@ -3999,10 +4544,7 @@ async def play_files(
 
     if not added:
         return await interaction.followup.send(
-            embed=Embed(
-                description=get_messages("player.play_files.error.no_valid_files", gid),
-                color=0xFF9AA2 if is_kw else discord.Color.red(),
-            ),
+            embed=error_embed("player.play_files.error.no_valid_files", gid),
             ephemeral=True,
             silent=True,
         )
@@ -4041,7 +4583,6 @@ async def queue_cmd(interaction: discord.Interaction):
     gid = interaction.guild.id
     state = get_guild_state(gid)
     mp = state.music_player
-    is_kw = state.locale == Locale.EN_X_KAWAII
 
     is_247n = state._24_7_mode and not mp.autoplay_enabled
     if is_247n and mp.radio_playlist:
@@ -4056,10 +4597,7 @@ async def queue_cmd(interaction: discord.Interaction):
 
     if not tracks and not mp.current_info:
         return await interaction.followup.send(
-            embed=Embed(
-                description=get_messages("queue_empty", gid),
-                color=0xFF9AA2 if is_kw else discord.Color.red(),
-            ),
+            embed=error_embed("queue_empty", gid),
             ephemeral=True,
             silent=True,
         )
@@ -4081,10 +4619,11 @@ async def clear_queue(interaction: discord.Interaction):
     state = get_guild_state(gid)
     mp = state.music_player
     is_kw = state.locale == Locale.EN_X_KAWAII
+    cancel_prefetch(mp)
     mp.queue = asyncio.Queue(maxsize=5000)
     mp.history.clear()
     mp.radio_playlist.clear()
-    bot.loop.create_task(update_controller(bot, gid))
+    spawn(update_controller(bot, gid))
     await interaction.response.send_message(
         embed=Embed(
             description=get_messages("clear_queue_success", gid),
@@ -4114,10 +4653,7 @@ async def skip(
 
     if not vc or not (vc.is_playing() or vc.is_paused()):
         return await interaction.response.send_message(
-            embed=Embed(
-                description=get_messages("no_song", gid),
-                color=0xFF9AA2 if is_kw else discord.Color.red(),
-            ),
+            embed=error_embed("no_song", gid),
             ephemeral=True,
             silent=True,
         )
@@ -4140,7 +4676,7 @@ async def skip(
                 )
             q = list(mp.queue._queue)
             idx = number - 1
-            mp.history.extend(q[:idx])
+            push_history(mp, *q[:idx])
             nq = asyncio.Queue(maxsize=5000)  # ← Maintain maxsize limit
             for item in q[idx:]:
                 await nq.put(item)
@@ -4165,9 +4701,8 @@ async def skip(
         title=get_messages("skip_confirmation", gid),
         color=0xE2F0CB if is_kw else discord.Color.blue(),
     )
-    q_snap = list(mp.queue._queue)
-    if q_snap:
-        ni = get_track_display_info(q_snap[0])
+    if not mp.queue.empty():
+        ni = get_track_display_info(mp.queue._queue[0])
         nt = ni.get("title", "?")
         embed.description = f"▶️ [{nt}]({ni.get('webpage_url','#')})"
     await interaction.followup.send(embed=embed, silent=SILENT_MESSAGES)
@@ -4193,7 +4728,7 @@ async def loop_cmd(interaction: discord.Interaction):
         ),
         silent=SILENT_MESSAGES,
     )
-    bot.loop.create_task(update_controller(bot, gid))
+    spawn(update_controller(bot, gid))
 
 
 @bot.tree.command(name="stop", description="Stop playback and disconnect")
@@ -4203,7 +4738,6 @@ async def stop_cmd(interaction: discord.Interaction):
     gid = interaction.guild_id
     state = get_guild_state(gid)
     mp = state.music_player
-    is_kw = state.locale == Locale.EN_X_KAWAII
 
     if mp.lyrics_task and not mp.lyrics_task.done():
         mp.lyrics_task.cancel()
@@ -4212,23 +4746,18 @@ async def stop_cmd(interaction: discord.Interaction):
         await safe_stop(mp.voice_client)
         if mp.current_task and not mp.current_task.done():
             mp.current_task.cancel()
+        release_player(mp)
         await mp.voice_client.disconnect()
         clear_audio_cache(gid)
         get_guild_state(gid).music_player = MusicPlayer()
-        bot.loop.create_task(update_controller(bot, gid))
+        spawn(update_controller(bot, gid))
         await interaction.response.send_message(
-            embed=Embed(
-                description=get_messages("stop", gid),
-                color=0xFF9AA2 if is_kw else discord.Color.red(),
-            ),
+            embed=error_embed("stop", gid),
             silent=SILENT_MESSAGES,
         )
     else:
         await interaction.response.send_message(
-            embed=Embed(
-                description=get_messages("not_connected", gid),
-                color=0xFF9AA2 if is_kw else discord.Color.red(),
-            ),
+            embed=error_embed("not_connected", gid),
             ephemeral=True,
             silent=True,
         )
@@ -4246,7 +4775,9 @@ async def pause(interaction: discord.Interaction):
     vc = await ensure_voice_connection(interaction)
     if vc and vc.is_playing():
         if mp.playback_started_at:
-            mp.start_time += (time.time() - mp.playback_started_at) * mp.playback_speed
+            mp.start_time += (
+                time.monotonic() - mp.playback_started_at
+            ) * mp.playback_speed
             mp.playback_started_at = None
         vc.pause()
         await interaction.followup.send(
@@ -4256,13 +4787,10 @@ async def pause(interaction: discord.Interaction):
             ),
             silent=SILENT_MESSAGES,
         )
-        bot.loop.create_task(update_controller(bot, gid))
+        spawn(update_controller(bot, gid))
     else:
         await interaction.followup.send(
-            embed=Embed(
-                description=get_messages("no_playback", gid),
-                color=0xFF9AA2 if is_kw else discord.Color.red(),
-            ),
+            embed=error_embed("no_playback", gid),
             ephemeral=True,
             silent=True,
         )
@@ -4280,8 +4808,9 @@ async def resume(interaction: discord.Interaction):
     vc = await ensure_voice_connection(interaction)
     if vc and vc.is_paused():
         if mp.playback_started_at is None:
-            mp.playback_started_at = time.time()
+            mp.playback_started_at = time.monotonic()
         vc.resume()
+        await apply_volume(mp)  # volume may have changed while paused
         await interaction.followup.send(
             embed=Embed(
                 description=get_messages("resume", gid),
@@ -4289,13 +4818,10 @@ async def resume(interaction: discord.Interaction):
             ),
             silent=SILENT_MESSAGES,
         )
-        bot.loop.create_task(update_controller(bot, gid))
+        spawn(update_controller(bot, gid))
     else:
         await interaction.followup.send(
-            embed=Embed(
-                description=get_messages("no_paused", gid),
-                color=0xFF9AA2 if is_kw else discord.Color.red(),
-            ),
+            embed=error_embed("no_paused", gid),
             ephemeral=True,
             silent=True,
         )
@@ -4311,10 +4837,7 @@ async def shuffle_cmd(interaction: discord.Interaction):
     is_kw = state.locale == Locale.EN_X_KAWAII
     if mp.queue.empty():
         return await interaction.response.send_message(
-            embed=Embed(
-                description=get_messages("queue_empty", gid),
-                color=0xFF9AA2 if is_kw else discord.Color.red(),
-            ),
+            embed=error_embed("queue_empty", gid),
             ephemeral=True,
             silent=True,
         )
@@ -4331,7 +4854,7 @@ async def shuffle_cmd(interaction: discord.Interaction):
         ),
         silent=SILENT_MESSAGES,
     )
-    bot.loop.create_task(update_controller(bot, gid))
+    spawn(update_controller(bot, gid))
 
 
 @bot.tree.command(name="nowplaying", description="Show currently playing song")
@@ -4344,10 +4867,7 @@ async def now_playing(interaction: discord.Interaction):
     is_kw = state.locale == Locale.EN_X_KAWAII
     if not mp.current_info:
         return await interaction.response.send_message(
-            embed=Embed(
-                description=get_messages("no_song_playing", gid),
-                color=0xFF9AA2 if is_kw else discord.Color.red(),
-            ),
+            embed=error_embed("no_song_playing", gid),
             ephemeral=True,
             silent=True,
         )
@@ -4388,7 +4908,7 @@ async def toggle_autoplay(interaction: discord.Interaction):
         ),
         silent=SILENT_MESSAGES,
     )
-    bot.loop.create_task(update_controller(bot, gid))
+    spawn(update_controller(bot, gid))
 
 
 @bot.tree.command(name="volume", description="Set music volume (0-200%)")
@@ -4401,10 +4921,8 @@ async def volume(
         return
     gid = interaction.guild.id
     mp = get_player(gid)
-    vc = interaction.guild.voice_client
     mp.volume = level / 100.0
-    if vc and vc.is_playing() and isinstance(vc.source, discord.PCMVolumeTransformer):
-        vc.source.volume = mp.volume
+    await apply_volume(mp)
     await interaction.response.send_message(
         embed=Embed(
             description=get_messages("volume_success", gid, level=level),
@@ -4412,7 +4930,7 @@ async def volume(
         ),
         silent=SILENT_MESSAGES,
     )
-    bot.loop.create_task(update_controller(bot, gid))
+    spawn(update_controller(bot, gid))
 
 
 @bot.tree.command(name="filter", description="Apply/remove audio filters in real time.")
@@ -4427,10 +4945,7 @@ async def filter_command(interaction: discord.Interaction):
         mp.voice_client.is_playing() or mp.voice_client.is_paused()
     ):
         return await interaction.response.send_message(
-            embed=Embed(
-                description=get_messages("filter.no_playback", gid),
-                color=0xFF9AA2 if is_kw else discord.Color.red(),
-            ),
+            embed=error_embed("filter.no_playback", gid),
             ephemeral=True,
             silent=True,
         )
@@ -4486,10 +5001,7 @@ async def remove_cmd(interaction: discord.Interaction):
     is_kw = state.locale == Locale.EN_X_KAWAII
     if mp.queue.empty():
         return await interaction.response.send_message(
-            embed=Embed(
-                description=get_messages("queue_empty", gid),
-                color=0xFF9AA2 if is_kw else discord.Color.red(),
-            ),
+            embed=error_embed("queue_empty", gid),
             ephemeral=True,
             silent=True,
         )
@@ -4552,10 +5064,7 @@ async def search_cmd(interaction: discord.Interaction, query: str):
     except Exception as e:
         logger.error(f"/search error: {e}")
         await interaction.followup.send(
-            embed=Embed(
-                description=get_messages("search_error", gid),
-                color=0xFF9AA2 if is_kw else discord.Color.red(),
-            ),
+            embed=error_embed("search_error", gid),
             ephemeral=True,
             silent=True,
         )
@@ -4571,10 +5080,7 @@ async def jumpto(interaction: discord.Interaction):
     is_kw = state.locale == Locale.EN_X_KAWAII
     if mp.queue.empty():
         return await interaction.response.send_message(
-            embed=Embed(
-                description=get_messages("queue_empty", gid),
-                color=0xFF9AA2 if is_kw else discord.Color.red(),
-            ),
+            embed=error_embed("queue_empty", gid),
             ephemeral=True,
             silent=True,
         )
@@ -4666,7 +5172,8 @@ async def karaoke_cmd(interaction: discord.Interaction):
         for q in [f"{clean} {artist}", clean]:
             try:
                 lrc = await asyncio.wait_for(
-                    loop.run_in_executor(None, syncedlyrics.search, q), timeout=7.0
+                    loop.run_in_executor(_LYRICS_POOL, syncedlyrics.search, q),
+                    timeout=7.0,
                 )
                 if lrc:
                     break
@@ -4726,10 +5233,7 @@ async def play_next(
 
     if (query and file) or (not query and not file):
         return await interaction.response.send_message(
-            embed=Embed(
-                description=get_messages("player.play_next.error.invalid_args", gid),
-                color=0xFF9AA2 if is_kw else discord.Color.red(),
-            ),
+            embed=error_embed("player.play_next.error.invalid_args", gid),
             ephemeral=True,
             silent=True,
         )
@@ -4766,10 +5270,7 @@ async def play_next(
         except Exception as e:
             logger.error(f"/playnext error: {e}")
             return await interaction.followup.send(
-                embed=Embed(
-                    description=get_messages("search_error", gid),
-                    color=0xFF9AA2 if is_kw else discord.Color.red(),
-                ),
+                embed=error_embed("search_error", gid),
                 ephemeral=True,
                 silent=True,
             )
@@ -4822,7 +5323,7 @@ async def play_next(
         if item.get("thumbnail"):
             embed.set_thumbnail(url=item["thumbnail"])
         await interaction.followup.send(embed=embed, silent=SILENT_MESSAGES)
-        bot.loop.create_task(update_controller(bot, gid))
+        spawn(update_controller(bot, gid))
         if not (vc.is_playing() or vc.is_paused()):
             mp.current_task = asyncio.create_task(play_audio(gid))
 
@@ -4843,10 +5344,7 @@ async def reconnect_cmd(interaction: discord.Interaction):
         return
     if not mp.current_info:
         return await interaction.response.send_message(
-            embed=Embed(
-                description=get_messages("reconnect_not_playing", gid),
-                color=0xFF9AA2 if is_kw else discord.Color.red(),
-            ),
+            embed=error_embed("reconnect_not_playing", gid),
             ephemeral=True,
             silent=True,
         )
@@ -4856,7 +5354,7 @@ async def reconnect_cmd(interaction: discord.Interaction):
 
     ts = mp.start_time
     if mp.playback_started_at:
-        ts += (time.time() - mp.playback_started_at) * mp.playback_speed
+        ts += (time.monotonic() - mp.playback_started_at) * mp.playback_speed
 
     ch = vc.channel
     try:
@@ -5103,48 +5601,53 @@ async def discord_cmd(interaction: discord.Interaction):
     )
 
 
-@bot.tree.command(name="support", description="Show ways to support Playify.")
-async def support_cmd(interaction: discord.Interaction):
-    if not interaction.guild:
-        return
-    gid = interaction.guild_id
-    is_kw = get_mode(gid)
+@functools.lru_cache(maxsize=None)
+def _support_embed_dict(locale: Locale) -> dict:
+    """The /support embed is static per locale; build it once and reuse."""
+
+    def t(key, **kwargs):
+        return translator.t(key, locale=locale.value, **kwargs)
+
     embed = Embed(
-        title=get_messages("support_title", gid),
-        description=get_messages("support_description", gid),
-        color=0xFFC300 if not is_kw else 0xFFB6C1,
+        title=t("support_title"),
+        description=t("support_description"),
+        color=0xFFC300 if locale != Locale.EN_X_KAWAII else 0xFFB6C1,
     )
     embed.add_field(
-        name=get_messages("support_patreon_title", gid),
-        value=get_messages(
-            "support.patreon_value", gid, link="https://patreon.com/Playify"
-        ),
+        name=t("support_patreon_title"),
+        value=t("support.patreon_value", link="https://patreon.com/Playify"),
         inline=True,
     )
     embed.add_field(
-        name=get_messages("support_paypal_title", gid),
-        value=get_messages(
-            "support.paypal_value",
-            gid,
-            link="https://www.paypal.com/paypalme/alanmussot1",
+        name=t("support_paypal_title"),
+        value=t(
+            "support.paypal_value", link="https://www.paypal.com/paypalme/alanmussot1"
         ),
         inline=True,
     )
     embed.add_field(name="\u200b", value="\u200b", inline=False)
     embed.add_field(
-        name=get_messages("support_discord_title", gid),
-        value=get_messages(
-            "support.discord_value", gid, link="https://discord.gg/JeH8g6g3cG"
-        ),
+        name=t("support_discord_title"),
+        value=t("support.discord_value", link="https://discord.gg/JeH8g6g3cG"),
         inline=True,
     )
     embed.add_field(
-        name=get_messages("support_contact_title", gid),
-        value=get_messages("support.contact_value", gid, username="@alananasssss"),
+        name=t("support_contact_title"),
+        value=t("support.contact_value", username="@alananasssss"),
         inline=True,
     )
+    embed.set_footer(text=t("support.footer"))
+    return embed.to_dict()
+
+
+@bot.tree.command(name="support", description="Show ways to support Playify.")
+async def support_cmd(interaction: discord.Interaction):
+    if not interaction.guild:
+        return
+    locale = get_guild_state(interaction.guild_id).locale
+    # from_dict gives a fresh Embed so the cached dict is never mutated
+    embed = Embed.from_dict(_support_embed_dict(locale))
     embed.set_thumbnail(url=bot.user.avatar.url)
-    embed.set_footer(text=get_messages("support.footer", gid))
     await interaction.response.send_message(embed=embed, silent=SILENT_MESSAGES)
 
 
@@ -5183,7 +5686,7 @@ class SetupCommands(app_commands.Group):
                     await (
                         await old_ch.fetch_message(state.controller_message_id)
                     ).delete()
-            except Exception:
+            except discord.HTTPException:
                 pass
 
         state.controller_channel_id = target.id
@@ -5383,6 +5886,7 @@ async def on_ready():
         bot.start_time = time.time()
     logger.info(f"{bot.user.name} is online.")
     bot.tree.interaction_check = global_interaction_check
+    load_opus()
 
     for guild in bot.guilds:
         bot.add_view(MusicControllerView(bot, guild.id))
@@ -5422,14 +5926,44 @@ async def on_ready():
             else:
                 await asyncio.sleep(30)
 
-    bot.loop.create_task(rotate_presence())
+    spawn(rotate_presence())
     await setup_profile(bot)
     await load_states_on_startup()
 
 
+@bot.event
+async def on_guild_remove(guild: discord.Guild):
+    """Drop in-memory state for guilds we were removed from (settings stay in DB)."""
+    with _guild_states_lock:
+        state = guild_states.pop(guild.id, None)
+    _vc_status_pending.pop(guild.id, None)
+    if not state:
+        return
+    mp = state.music_player
+    release_player(mp)
+    for task in (
+        mp.current_task,
+        mp.pending_disconnect_task,
+        state._controller_update_task,
+        state._status_update_task,
+    ):
+        if task and not task.done():
+            task.cancel()
+    clear_audio_cache(guild.id)
+
+
 @bot.event
 async def on_voice_state_update(member, before, after):
+    # Mute/deafen/stream toggles: channel unchanged, nothing to do
+    if before.channel == after.channel:
+        return
     guild = member.guild
+    # The bot joined, moved or left: joins/leaves seen while it was away were
+    # not counted, so force a rescan. This must run before the voice_client
+    # check, which discord.py has already cleared on a self-disconnect.
+    if member.id == bot.user.id and guild.id in guild_states:
+        guild_states[guild.id].music_player.human_count_channel_id = None
+
     vc = guild.voice_client
     if not vc or not vc.channel:
         return
@@ -5451,7 +5985,7 @@ async def on_voice_state_update(member, before, after):
                 return
             ts = mp.start_time
             if mp.playback_started_at:
-                ts += (time.time() - mp.playback_started_at) * mp.playback_speed
+                ts += (time.monotonic() - mp.playback_started_at) * mp.playback_speed
             if mp.current_task and not mp.current_task.done():
                 mp.current_task.cancel()
 
@@ -5468,23 +6002,32 @@ async def on_voice_state_update(member, before, after):
                     logger.error(f"24/7 auto-reconnect failed: {e}")
                     mp.voice_client = None
 
-            bot.loop.create_task(reconnect_247())
+            spawn(reconnect_247())
             return
 
         clear_audio_cache(gid)
         if mp.current_task and not mp.current_task.done():
             mp.current_task.cancel()
+        release_player(mp)
         state.music_player = MusicPlayer()
         state.server_filters = set()
         state._24_7_mode = False
         return
 
     bot_ch = vc.channel
-    humans_in_channel = [m for m in bot_ch.members if not m.bot]
+    if mp.human_count_channel_id != bot_ch.id:
+        humans = count_humans(mp, bot_ch)  # cache already reflects this event
+    else:
+        if not member.bot:
+            if before.channel == bot_ch:
+                mp.human_count = max(0, mp.human_count - 1)
+            elif after.channel == bot_ch:
+                mp.human_count += 1
+        humans = mp.human_count
 
     # User left — bot now alone
     if not member.bot and before.channel == bot_ch and after.channel != bot_ch:
-        if not humans_in_channel:
+        if not humans:
             if state._24_7_mode:
                 # In 24/7 mode, keep music playing even when alone
                 # Make sure silence loop is ready if music stops for any reason
@@ -5495,23 +6038,33 @@ async def on_voice_state_update(member, before, after):
                     mp.is_paused_by_leave = True
                     if mp.playback_started_at:
                         mp.start_time += (
-                            time.time() - mp.playback_started_at
+                            time.monotonic() - mp.playback_started_at
                         ) * mp.playback_speed
                         mp.playback_started_at = None
                     await safe_stop(vc)
 
                 async def _leave_if_still_alone():
                     await asyncio.sleep(60)
-                    if vc.is_connected() and not [
-                        m for m in vc.channel.members if not m.bot
-                    ]:
+                    if not vc.is_connected():
+                        return
+                    # Final decision rescans the roster: a missed voice event
+                    # (e.g. after a re-identify) must not strand listeners
+                    player = state.music_player
+                    player.human_count_channel_id = None
+                    if count_humans(player, vc.channel) == 0:
                         await vc.disconnect()
 
-                bot.loop.create_task(_leave_if_still_alone())
+                # One timer per guild: a newer "left" event restarts it
+                if mp.pending_disconnect_task and not mp.pending_disconnect_task.done():
+                    mp.pending_disconnect_task.cancel()
+                mp.pending_disconnect_task = spawn(_leave_if_still_alone())
 
     # First human rejoins
     if not member.bot and after.channel == bot_ch and before.channel != bot_ch:
-        if len(humans_in_channel) == 1:
+        if mp.pending_disconnect_task and not mp.pending_disconnect_task.done():
+            mp.pending_disconnect_task.cancel()
+        mp.pending_disconnect_task = None
+        if humans == 1:
             if state._24_7_mode and vc.is_playing():
                 # Music is already playing in 24/7 mode, no need to resume
                 pass
@@ -5529,11 +6082,9 @@ async def on_voice_state_update(member, before, after):
                     ts = mp.start_time
                     if mp.is_current_live:
                         mp.is_resuming_live = True
-                        bot.loop.create_task(play_audio(gid, is_a_loop=True))
+                        spawn(play_audio(gid, is_a_loop=True))
                     else:
-                        bot.loop.create_task(
-                            play_audio(gid, seek_time=ts, is_a_loop=True)
-                        )
+                        spawn(play_audio(gid, seek_time=ts, is_a_loop=True))
 
 
 # ==============================================================================
@@ -816,7 +816,7 @@ Di bagian after_playing callback, setelah `mp.current_info = None`, tambahkan:
             # Hitung durasi yang benar-benar diputar
             played_ms = 0
             if mp.playback_started_at:
-                played_ms = int((time.time() - (mp.playback_started_at or time.time())) * 1000)
+                played_ms = int((time.monotonic() - (mp.playback_started_at or time.monotonic())) * 1000)
             
             # Ambil semua user di voice channel saat lagu selesai
             vc_members = []